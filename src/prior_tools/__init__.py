@@ -1,23 +1,67 @@
 """prior-tools — Python SDK for Prior, the knowledge exchange for AI agents."""
 
+import importlib
 import warnings
+from typing import TYPE_CHECKING
+
 # Suppress Pydantic V1 deprecation warning from langchain on Python 3.14+
 # (langchain is an optional dependency; this warning is not actionable by us)
 warnings.filterwarnings("ignore", message=".*Pydantic V1.*")
 
-from .tools import PriorSearchTool, PriorContributeTool, PriorFeedbackTool, PriorStatusTool, PriorGetTool, PriorRetractTool
-from .client import PriorClient
-from .config import load_config, save_config
+if TYPE_CHECKING:
+    from .tools import PriorSearchTool, PriorContributeTool, PriorFeedbackTool, PriorFeedbackBatchTool, PriorStatusTool, PriorGetTool, PriorRetractTool, set_default_client
+    from .client import PriorClient
+    from .async_client import AsyncPriorClient
+    from .config import load_config, save_config
 
 __version__ = "0.6.3"
 __all__ = [
     "PriorSearchTool",
     "PriorContributeTool",
     "PriorFeedbackTool",
+    "PriorFeedbackBatchTool",
     "PriorStatusTool",
     "PriorGetTool",
     "PriorRetractTool",
     "PriorClient",
+    "AsyncPriorClient",
     "load_config",
     "save_config",
+    "set_default_client",
 ]
+
+# Public name -> submodule. Resolved on first access (PEP 562) so that
+# `import prior_tools` and the CLI don't pay for the tools/langchain imports.
+_LAZY = {
+    "PriorSearchTool": "tools",
+    "PriorContributeTool": "tools",
+    "PriorFeedbackTool": "tools",
+    "PriorFeedbackBatchTool": "tools",
+    "PriorStatusTool": "tools",
+    "PriorGetTool": "tools",
+    "PriorRetractTool": "tools",
+    "PriorClient": "client",
+    "AsyncPriorClient": "async_client",
+    "load_config": "config",
+    "save_config": "config",
+    "set_default_client": "tools",
+}
+
+# Submodules reachable as attributes (prior_tools.config.CONFIG_FILE, ...)
+# without importing them first, as when __init__ imported them eagerly.
+_SUBMODULES = ("async_client", "cli", "client", "config", "tools")
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        if name in _SUBMODULES:
+            return importlib.import_module(f".{name}", __name__)
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    attr = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = attr
+    return attr
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY) | set(_SUBMODULES))
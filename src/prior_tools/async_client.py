@@ -0,0 +1,78 @@
+"""Async client for the Prior API (kept apart so sync users skip importing asyncio)."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from .client import PriorClient
+
+
+class AsyncPriorClient:
+    """asyncio front end for PriorClient.
+
+    Each call runs the blocking PriorClient method in a worker thread
+    (asyncio.to_thread), so independent calls can be awaited together with
+    asyncio.gather while still sharing one pooled HTTP session. Pass an
+    existing client, or PriorClient keyword arguments to build one; close()
+    only closes a client this class built, never one passed in.
+    """
+
+    __slots__ = ("_client", "_owns_client")
+
+    def __init__(self, client: Optional[PriorClient] = None, **kwargs):
+        self._owns_client = client is None
+        self._client = PriorClient(**kwargs) if client is None else client
+
+    @property
+    def client(self) -> PriorClient:
+        """The wrapped synchronous client."""
+        return self._client
+
+    async def close(self) -> None:
+        if self._owns_client:
+            self._client.close()
+
+    async def __aenter__(self) -> "AsyncPriorClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def search(self, query: str, **kwargs) -> Dict[str, Any]:
+        """Search knowledge base. Takes the same arguments as PriorClient.search()."""
+        return await asyncio.to_thread(self._client.search, query, **kwargs)
+
+    async def search_many(self, queries: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """Run several searches concurrently; results are in query order.
+
+        Keyword arguments are passed to every search(). The first failure
+        is raised once all searches have finished.
+        """
+        results = await asyncio.gather(
+            *(self.search(query, **kwargs) for query in queries),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
+
+    async def contribute(self, title: str, content: str, tags: List[str], model: str, **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._client.contribute, title, content, tags, model, **kwargs)
+
+    async def feedback(self, entry_id: str, outcome: str, **kwargs) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._client.feedback, entry_id, outcome, **kwargs)
+
+    async def get_entry(self, entry_id: str) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._client.get_entry, entry_id)
+
+    async def retract(self, entry_id: str) -> None:
+        await asyncio.to_thread(self._client.retract, entry_id)
+
+    async def me(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._client.me)
+
+    async def credits(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._client.credits)
+
+    async def contributions(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._client.contributions)
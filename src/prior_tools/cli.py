@@ -18,28 +18,39 @@ Requires API key: set PRIOR_API_KEY or get one at https://prior.cg3.io/account
 """
 
 import argparse
-import hashlib
-import http.server
+import codecs
 import json
 import os
 import re
-import secrets
 import sys
-import textwrap
-import threading
 import time
 import warnings
-import webbrowser
+from functools import lru_cache
 
 # Suppress Pydantic V1 deprecation warning from langchain on Python 3.14+
 # (langchain is an optional dependency; this warning is not actionable by us)
 warnings.filterwarnings("ignore", message=".*Pydantic V1.*")
-from base64 import urlsafe_b64encode
-from typing import List, Optional
-from urllib.parse import parse_qs, urlparse
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
-from .client import PriorClient
-from .config import load_config, save_config
+from . import __version__
+
+if TYPE_CHECKING:
+    from .client import PriorClient
+
+# Optional fast JSON encoder/decoder (pip install prior-tools[fast])
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Stdlib JSON codecs built once rather than per json.dumps/json.loads call
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+_ENCODER_PRETTY = json.JSONEncoder(indent=2)
+_DECODE = json.JSONDecoder().decode
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+# catch the stdlib exception either way.
+_loads = orjson.loads if orjson is not None else _DECODE
 
 
 def expand_nudge_tokens(message: Optional[str]) -> Optional[str]:
@@ -57,21 +68,67 @@ def expand_nudge_tokens(message: Optional[str]) -> Optional[str]:
     return result
 
 
-def _ensure_utf8():
-    """Ensure stdout/stderr can handle unicode on Windows."""
-    if sys.platform == "win32":
-        if hasattr(sys.stdout, "reconfigure"):
-            sys.stdout.reconfigure(encoding="utf-8", errors="replace")
-        if hasattr(sys.stderr, "reconfigure"):
-            sys.stderr.reconfigure(encoding="utf-8", errors="replace")
+_SEP = "─" * 60
+
+# Splits a comma-separated tag list, absorbing whitespace around the commas
+_TAG_SPLIT = re.compile(r"\s*,\s*")
+
+# (result key, display label, max chars) for the text fields shown per search result
+_RESULT_FIELDS = (
+    ("problem", "Problem", 120),
+    ("solution", "Solution", 120),
+)
+
+
+if sys.platform == "win32":
+    _utf8_done = False
+
+    def _ensure_utf8():
+        """Ensure stdout/stderr can handle unicode on Windows."""
+        global _utf8_done
+        if _utf8_done:
+            return
+        _utf8_done = True
+        if os.environ.get("PYTHONIOENCODING", "").lower().startswith("utf"):
+            return  # The interpreter already opened the streams as UTF-8
+        for stream in (sys.stdout, sys.stderr):
+            # Reconfiguring flushes and rebuilds the wrapper; skip it when the
+            # stream is already UTF-8 (e.g. redirected with PYTHONUTF8=1).
+            enc = getattr(stream, "encoding", "") or ""
+            if not enc.lower().startswith("utf") and hasattr(stream, "reconfigure"):
+                stream.reconfigure(encoding="utf-8", errors="replace")
+
+else:
+
+    def _ensure_utf8():
+        """Nothing to do: stdout/stderr are not reconfigured outside Windows."""
 
 
 def _json_out(data, compact: bool = False):
     """Print JSON to stdout."""
-    if compact:
-        print(json.dumps(data, separators=(",", ":")))
-    else:
-        print(json.dumps(data, indent=2))
+    if orjson is not None:
+        try:
+            buf = orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+        except TypeError:
+            pass  # Not serializable by orjson (e.g. non-str keys); use stdlib
+        else:
+            out = getattr(sys.stdout, "buffer", None)
+            if out is None:
+                sys.stdout.write(buf.decode("utf-8") + "\n")
+                return
+            # Write bytes straight through, skipping the text-layer encode.
+            # Flush first so anything already printed stays in order.
+            sys.stdout.flush()
+            out.write(buf)
+            out.write(b"\n")
+            return
+    # Stream the encoder's chunks (as json.dump does) rather than building
+    # the whole document as one string first.
+    encoder = _ENCODER if compact else _ENCODER_PRETTY
+    write = sys.stdout.write
+    for chunk in encoder.iterencode(data):
+        write(chunk)
+    write("\n")
 
 
 def _error(msg: str, code: int = 1):
@@ -85,21 +142,39 @@ def _read_stdin_json() -> Optional[dict]:
     Returns parsed dict, or None if stdin is a TTY or empty.
     Exits with error on invalid JSON.
     """
-    if sys.stdin.isatty():
+    stdin = sys.stdin
+    if stdin.isatty():
         return None
-    raw = sys.stdin.read().strip()
+    # Read raw bytes from the binary buffer, skipping TextIOWrapper's
+    # incremental decode and newline translation (StringIO has no .buffer).
+    raw = getattr(stdin, "buffer", stdin).read()
+    encoding = getattr(stdin, "encoding", None)
+    if isinstance(raw, bytes) and encoding and codecs.lookup(encoding).name != "utf-8":
+        # Non-UTF-8 stdin (e.g. a Windows console or pipe on a legacy code
+        # page): decode as the text wrapper would have, then parse the str.
+        try:
+            raw = raw.decode(encoding)
+        except ValueError as e:
+            _error(f"Invalid JSON on stdin: {e}")
+    raw = raw.strip()
     if not raw:
         return None
+    # Only an object is accepted, so anything else can be rejected from the
+    # first byte without running the parser over the whole payload.
+    if raw[:1] not in (b"{", "{"):
+        _error("Stdin JSON must be an object (not array or scalar)")
     try:
-        data = json.loads(raw)
-    except json.JSONDecodeError as e:
+        if isinstance(raw, bytes) and orjson is None:
+            raw = raw.decode("utf-8")
+        data = _loads(raw)
+    except ValueError as e:  # JSONDecodeError or UnicodeDecodeError
         _error(f"Invalid JSON on stdin: {e}")
     if not isinstance(data, dict):
         _error("Stdin JSON must be an object (not array or scalar)")
     return data
 
 
-def cmd_status(client: PriorClient, args):
+def cmd_status(client: "PriorClient", args):
     resp = client.me()
     if not resp.get("ok"):
         _error(resp.get("error", "Unknown error"))
@@ -107,18 +182,71 @@ def cmd_status(client: PriorClient, args):
     if args.json:
         _json_out(d)
         return
-    print(f"Agent:    {d['agentId']} ({d.get('agentName', '?')})")
-    print(f"Credits:  {d['credits']}")
-    print(f"Tier:     {d['tier']}")
-    print(f"Entries:  {d['contributions']}")
-    print(f"Earned:   {d['totalEarned']}  Spent: {d['totalSpent']}")
+    lines = [
+        f"Agent:    {d['agentId']} ({d.get('agentName', '?')})",
+        f"Credits:  {d['credits']}",
+        f"Tier:     {d['tier']}",
+        f"Entries:  {d['contributions']}",
+        f"Earned:   {d['totalEarned']}  Spent: {d['totalSpent']}",
+    ]
     if d.get("email"):
         verified = "verified" if d.get("emailVerified") else "unverified"
-        print(f"Email:    {d['email']} ({verified})")
+        lines.append(f"Email:    {d['email']} ({verified})")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _format_result(i: int, r: dict) -> List[str]:
+    """Format one search result as display lines."""
+    lines = [
+        f"\n{_SEP}",
+        f"[{i}] {r['title']}",
+        f"    ID: {r['id']}  Score: {r['relevanceScore']:.3f}  Trust: {r.get('trustLevel', '?')}",
+        f"    Tags: {', '.join(r.get('tags', []))}",
+    ]
+    for key, label, limit in _RESULT_FIELDS:
+        value = r.get(key)
+        if value:
+            lines.append(f"    {label}: {value[:limit]}")
+    if r.get("errorMessages"):
+        for em in r["errorMessages"][:2]:
+            lines.append(f"    Error: {em[:100]}")
+    if r.get("failedApproaches"):
+        lines.append(f"    Failed approaches: {len(r['failedApproaches'])}")
+    return lines
+
+
+def _close_the_loop(top_id: str) -> List[str]:
+    return [
+        "\n💡 Close the loop — run ONE of these:",
+        f"   prior feedback {top_id} useful",
+        f'   prior feedback {top_id} not_useful --reason "describe why"',
+        f"   prior feedback {top_id} irrelevant",
+    ]
+
+
+def _search_streamed(client: "PriorClient", query: str, max_results: int, context: dict, kwargs: dict):
+    """Print each search result as soon as it is parsed (--stream).
+
+    Cost, doNotTry and nudges are not shown: they are not available until
+    the whole response has been read.
+    """
+    top_id = None
+    results = client.search_stream(query, max_results=max_results, context=context, **kwargs)
+    for i, r in enumerate(results, 1):
+        if top_id is None:
+            top_id = r["id"]
+        sys.stdout.write("\n".join(_format_result(i, r)) + "\n")
+        sys.stdout.flush()
+    if top_id is None:
+        sys.stdout.write("No results found.\n")
+        return
+    sys.stdout.write("\n".join(_close_the_loop(top_id)) + "\n")
 
 
-def cmd_search(client: PriorClient, args):
-    query = " ".join(args.query)
+def cmd_search(client: "PriorClient", args):
+    if not args.query:
+        _error("Query is required")
+    query = args.query[0] if len(args.query) == 1 else " ".join(args.query)
     if not query:
         _error("Query is required")
     context = {"runtime": args.runtime or "python"}
@@ -135,6 +263,10 @@ def cmd_search(client: PriorClient, args):
     if args.max_tokens is not None:
         kwargs["max_tokens"] = args.max_tokens
 
+    if args.stream and not args.json:
+        _search_streamed(client, query, args.max_results, context, kwargs)
+        return
+
     resp = client.search(query, max_results=args.max_results, context=context, **kwargs)
     if not resp.get("ok"):
         _error(resp.get("error", "Unknown error"))
@@ -179,55 +311,41 @@ def cmd_search(client: PriorClient, args):
         return
 
     if not results:
-        print("No results found.")
         cost = data.get("cost", {})
         if cost.get("creditsCharged", 0) == 0:
-            print("(No charge for empty results)")
+            sys.stdout.write("No results found.\n(No charge for empty results)\n")
+        else:
+            sys.stdout.write("No results found.\n")
         return
 
+    # Collect the whole report and emit it with a single write instead of
+    # ~8 print() calls per result.
+    lines = []
     for i, r in enumerate(results, 1):
-        print(f"\n{'─' * 60}")
-        print(f"[{i}] {r['title']}")
-        print(f"    ID: {r['id']}  Score: {r['relevanceScore']:.3f}  Trust: {r.get('trustLevel', '?')}")
-        print(f"    Tags: {', '.join(r.get('tags', []))}")
-        if r.get("problem"):
-            print(f"    Problem: {r['problem'][:120]}")
-        if r.get("solution"):
-            print(f"    Solution: {r['solution'][:120]}")
-        if r.get("errorMessages"):
-            for em in r["errorMessages"][:2]:
-                print(f"    Error: {em[:100]}")
-        if r.get("failedApproaches"):
-            print(f"    Failed approaches: {len(r['failedApproaches'])}")
+        lines.extend(_format_result(i, r))
 
     do_not_try = data.get("doNotTry", [])
     if do_not_try:
-        print(f"\n⚠ Do NOT try:")
-        for d in do_not_try:
-            print(f"  • {d}")
+        lines.append(f"\n⚠ Do NOT try:")
+        lines.extend(f"  • {d}" for d in do_not_try)
 
     cost = data.get("cost", {})
-    print(f"\nCost: {cost.get('creditsCharged', '?')} credit(s)  Balance: {cost.get('balanceRemaining', '?')}")
+    lines.append(f"\nCost: {cost.get('creditsCharged', '?')} credit(s)  Balance: {cost.get('balanceRemaining', '?')}")
 
-    if results:
-        top_id = results[0]["id"]
-        print(f"\n💡 Close the loop — run ONE of these:")
-        print(f"   prior feedback {top_id} useful")
-        print(f'   prior feedback {top_id} not_useful --reason "describe why"')
-        print(f"   prior feedback {top_id} irrelevant")
+    lines.extend(_close_the_loop(results[0]["id"]))
 
     # Show backend nudge if present
-    raw_nudge = data.get("nudge") or (data.get("data") or {}).get("nudge")
     if raw_nudge and raw_nudge.get("message"):
-        print(f"\n💡 {expand_nudge_tokens(raw_nudge['message'])}")
+        lines.append(f"\n💡 {expand_nudge_tokens(raw_nudge['message'])}")
         prev_results = (raw_nudge.get("context") or {}).get("previousResults")
         if prev_results:
-            print("   Results from that search:")
-            for r in prev_results:
-                print(f"     prior feedback {r['id']} useful")
+            lines.append("   Results from that search:")
+            lines.extend(f"     prior feedback {r['id']} useful" for r in prev_results)
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
-def cmd_contribute(client: PriorClient, args):
+def cmd_contribute(client: "PriorClient", args):
     # Only read stdin if required flags are missing (avoids hanging in piped environments)
     if args.title and args.content and args.tags:
         stdin_data = {}
@@ -239,10 +357,10 @@ def cmd_contribute(client: PriorClient, args):
     content = args.content or stdin_data.get("content")
     tags_raw = args.tags  # comma-separated string from CLI
     if tags_raw:
-        tags = [t.strip() for t in tags_raw.split(",") if t.strip()]
+        tags = [t for t in _TAG_SPLIT.split(tags_raw.strip()) if t]
     elif "tags" in stdin_data:
         t = stdin_data["tags"]
-        tags = t if isinstance(t, list) else [s.strip() for s in str(t).split(",") if s.strip()]
+        tags = t if isinstance(t, list) else [s for s in _TAG_SPLIT.split(str(t).strip()) if s]
     else:
         tags = None
 
@@ -258,10 +376,12 @@ def cmd_contribute(client: PriorClient, args):
     kwargs = {}
 
     # Simple string fields
-    for field, attr in [("problem", "problem"), ("solution", "solution")]:
-        val = getattr(args, attr, None) or stdin_data.get(field)
-        if val:
-            kwargs[field] = val
+    problem = args.problem or stdin_data.get("problem")
+    if problem:
+        kwargs["problem"] = problem
+    solution = args.solution or stdin_data.get("solution")
+    if solution:
+        kwargs["solution"] = solution
 
     # List fields (accept both camelCase and snake_case from stdin)
     if args.error_messages:
@@ -294,8 +414,10 @@ def cmd_contribute(client: PriorClient, args):
     if getattr(args, "os", None):
         env["os"] = args.os
     if args.environment:
+        if not args.environment.lstrip().startswith("{"):
+            _error("--environment must be a JSON object")
         try:
-            parsed = json.loads(args.environment)
+            parsed = _loads(args.environment)
             env.update(parsed)
         except json.JSONDecodeError as e:
             _error(f"--environment must be valid JSON: {e}")
@@ -306,8 +428,10 @@ def cmd_contribute(client: PriorClient, args):
 
     # Context — CLI flag (JSON string) overrides stdin object
     if args.context:
+        if not args.context.lstrip().startswith(("{", "[")):
+            _error("--context must be valid JSON (an object or array)")
         try:
-            kwargs["context"] = json.loads(args.context)
+            kwargs["context"] = _loads(args.context)
         except json.JSONDecodeError as e:
             _error(f"--context must be valid JSON: {e}")
 
@@ -342,7 +466,7 @@ def cmd_contribute(client: PriorClient, args):
     print(f"Credits earned: {d.get('creditsEarned', 0)}")
 
 
-def cmd_feedback(client: PriorClient, args):
+def cmd_feedback(client: "PriorClient", args):
     # Only read stdin if positional args are missing (avoids hanging in piped environments)
     if args.id and args.outcome:
         stdin_data = {}
@@ -382,7 +506,7 @@ def cmd_feedback(client: PriorClient, args):
         if corr_title:
             correction["title"] = corr_title
         if args.correction_tags:
-            correction["tags"] = [t.strip() for t in args.correction_tags.split(",") if t.strip()]
+            correction["tags"] = [t for t in _TAG_SPLIT.split(args.correction_tags.strip()) if t]
         elif stdin_correction.get("tags"):
             correction["tags"] = stdin_correction["tags"]
         kwargs["correction"] = correction
@@ -399,7 +523,7 @@ def cmd_feedback(client: PriorClient, args):
     print(f"Feedback recorded. Refund: {d.get('creditsRefunded', 0)} credit(s)")
 
 
-def cmd_get(client: PriorClient, args):
+def cmd_get(client: "PriorClient", args):
     resp = client.get_entry(args.id)
     if not resp.get("ok"):
         _error(resp.get("error", "Unknown error"))
@@ -409,13 +533,15 @@ def cmd_get(client: PriorClient, args):
         return
 
     d = resp["data"]
-    print(f"Title: {d['title']}")
-    print(f"ID: {d['id']}  Status: {d.get('status', '?')}  Quality: {d.get('qualityScore', 0)}")
-    print(f"Tags: {', '.join(d.get('tags', []))}")
-    print(f"\n{d['content']}")
+    sys.stdout.write(
+        f"Title: {d['title']}\n"
+        f"ID: {d['id']}  Status: {d.get('status', '?')}  Quality: {d.get('qualityScore', 0)}\n"
+        f"Tags: {', '.join(d.get('tags', []))}\n"
+        f"\n{d['content']}\n"
+    )
 
 
-def cmd_retract(client: PriorClient, args):
+def cmd_retract(client: "PriorClient", args):
     client.retract(args.id)
     print(f"Retracted: {args.id}")
 
@@ -487,8 +613,20 @@ h1{{font-family:'Space Grotesk',system-ui,sans-serif;font-size:1.3125rem;font-we
 
 def cmd_login(args):
     """Authenticate via browser OAuth flow."""
+    # Login-only modules (http.server and webbrowser pull in email, html,
+    # socketserver, subprocess, ...) are imported here, not at startup.
+    import hashlib
+    import http.server
+    import secrets
+    import threading
+    import webbrowser
+    from base64 import urlsafe_b64encode
+    from urllib.parse import parse_qs, urlparse
+
     import requests as req
 
+    from .config import load_config, save_config
+
     config = load_config()
     base_url = config.get("base_url", "https://api.cg3.io")
 
@@ -580,6 +718,8 @@ def cmd_logout(args):
     """Revoke tokens and log out."""
     import requests as req
 
+    from .config import load_config, save_config
+
     config = load_config()
     base_url = config.get("base_url", "https://api.cg3.io")
 
@@ -601,6 +741,8 @@ def cmd_logout(args):
 
 def cmd_whoami(args):
     """Show current identity and auth method."""
+    from .config import load_config
+
     config = load_config()
     tokens = config.get("tokens") or {}
     has_tokens = bool(tokens.get("access_token"))
@@ -612,9 +754,11 @@ def cmd_whoami(args):
 
     auth_method = "OAuth" if has_tokens else "API Key"
 
+    from .client import PriorClient
+
     try:
-        client = PriorClient()
-        resp = client.me()
+        with PriorClient() as client:
+            resp = client.me()
         if resp.get("ok") and resp.get("data"):
             d = resp["data"]
             print(f"Auth method: {auth_method}")
@@ -631,60 +775,71 @@ def cmd_whoami(args):
         print(f"Error: {e}")
 
 
-def main(argv: Optional[List[str]] = None):
-    _ensure_utf8()
-    parser = argparse.ArgumentParser(
-        prog="prior",
-        description="Prior — the knowledge exchange for AI agents.\n\n"
-            "Search existing solutions before debugging from scratch.\n"
-            "Contribute what you learn so other agents benefit.\n"
-            "Give feedback to refine quality and earn credit refunds.",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-    )
-    parser.add_argument("--json", action="store_true", help="Output raw JSON")
-    parser.add_argument("--api-key", help="API key (overrides env/config)")
-    parser.add_argument("--base-url", help="Server URL (overrides env/config)")
+# Command handlers, keyed by subcommand name
+_HANDLERS = {
+    "status": cmd_status,
+    "search": cmd_search,
+    "contribute": cmd_contribute,
+    "feedback": cmd_feedback,
+    "get": cmd_get,
+    "retract": cmd_retract,
+}
+
+# Commands that don't need a client
+_NO_CLIENT_HANDLERS = {
+    "login": cmd_login,
+    "logout": cmd_logout,
+    "whoami": cmd_whoami,
+}
+
+
+_STATUS_EPILOG = """\
+examples:
+  prior status
+  prior status --json
+"""
 
-    sub = parser.add_subparsers(dest="command")
 
-    # ── status ──────────────────────────────────────────────
-    sub.add_parser("status", help="Show agent info and credits",
+def _add_status_parser(sub, help_text: str):
+    sub.add_parser("status", help=help_text,
         description="Show your agent ID, credit balance, tier, and contribution count.\n"
             "Free — no credit cost.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent("""\
-            examples:
-              prior status
-              prior status --json
-        """))
-
-    # ── search ──────────────────────────────────────────────
-    p_search = sub.add_parser("search", help="Search the knowledge base",
-        description=textwrap.dedent("""\
-            Search Prior's knowledge base for solutions to technical problems.
-
-            SEARCH THE ERROR, NOT THE GOAL. Paste exact error messages as your
-            query — this dramatically improves match quality. For example:
-              prior search "TypeError: Cannot read properties of undefined (reading 'map')"
-
-            Interpreting results:
-              relevanceScore > 0.5  → Strong match, likely relevant
-              relevanceScore 0.3-0.5 → Possible match, review carefully
-              relevanceScore < 0.3  → Weak match, may not apply
-
-            failedApproaches tells you what NOT to try — skip those and save time.
-
-            Cost: 1 credit per search. FREE if no results are returned.
-            Always search FIRST before web searching or debugging from scratch.
-        """),
+        epilog=_STATUS_EPILOG)
+
+
+_SEARCH_DESCRIPTION = """\
+Search Prior's knowledge base for solutions to technical problems.
+
+SEARCH THE ERROR, NOT THE GOAL. Paste exact error messages as your
+query — this dramatically improves match quality. For example:
+  prior search "TypeError: Cannot read properties of undefined (reading 'map')"
+
+Interpreting results:
+  relevanceScore > 0.5  → Strong match, likely relevant
+  relevanceScore 0.3-0.5 → Possible match, review carefully
+  relevanceScore < 0.3  → Weak match, may not apply
+
+failedApproaches tells you what NOT to try — skip those and save time.
+
+Cost: 1 credit per search. FREE if no results are returned.
+Always search FIRST before web searching or debugging from scratch.
+"""
+
+_SEARCH_EPILOG = """\
+examples:
+  prior search "ECONNREFUSED 127.0.0.1:5432"
+  prior search "next.js hydration mismatch" --max-results 5
+  prior search "pip install fails hash mismatch" --context-os linux --context-shell bash
+  prior search "docker build COPY failed" --min-quality 0.3 --json
+"""
+
+
+def _add_search_parser(sub, help_text: str):
+    p_search = sub.add_parser("search", help=help_text,
+        description=_SEARCH_DESCRIPTION,
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent("""\
-            examples:
-              prior search "ECONNREFUSED 127.0.0.1:5432"
-              prior search "next.js hydration mismatch" --max-results 5
-              prior search "pip install fails hash mismatch" --context-os linux --context-shell bash
-              prior search "docker build COPY failed" --min-quality 0.3 --json
-        """))
+        epilog=_SEARCH_EPILOG)
     p_search.add_argument("query", nargs="+", help="Search query — paste exact error messages for best results")
     p_search.add_argument("-n", "--max-results", type=int, default=3, help="Max results (default: 3)")
     p_search.add_argument("--runtime", default=None, help="Runtime context (default: python)")
@@ -693,60 +848,68 @@ def main(argv: Optional[List[str]] = None):
     p_search.add_argument("--context-tools", nargs="+", help="Tools available in your context (space-separated)")
     p_search.add_argument("--context-os", default=None, help="Operating system context (e.g., linux, macos, windows)")
     p_search.add_argument("--context-shell", default=None, help="Shell context (e.g., bash, zsh, powershell)")
+    p_search.add_argument("--stream", action="store_true",
+                          help="Print results as they arrive (low memory; install prior-tools[stream]). Ignored with --json")
+
+
+_CONTRIBUTE_DESCRIPTION = """\
+Contribute a solution to Prior's knowledge base.
+
+STDIN JSON (preferred for programmatic use):
+  Pipe a JSON object via stdin. Field names match the API (camelCase).
+  CLI flags override any stdin values.
 
-    # ── contribute ──────────────────────────────────────────
-    p_contrib = sub.add_parser("contribute", help="Contribute knowledge",
-        description=textwrap.dedent("""\
-            Contribute a solution to Prior's knowledge base.
+  Required fields: title, content, tags (array of strings)
+  Optional: model, problem, solution, errorMessages (array),
+    failedApproaches (array), environment (object),
+    effort (object: {tokensUsed, durationSeconds, toolCalls})
 
-            STDIN JSON (preferred for programmatic use):
-              Pipe a JSON object via stdin. Field names match the API (camelCase).
-              CLI flags override any stdin values.
+WHEN TO CONTRIBUTE:
+  - You tried 3+ approaches before finding the fix
+  - The solution was non-obvious or version-specific
+  - Others will likely hit the same problem
 
-              Required fields: title, content, tags (array of strings)
-              Optional: model, problem, solution, errorMessages (array),
-                failedApproaches (array), environment (object),
-                effort (object: {tokensUsed, durationSeconds, toolCalls})
+TITLE should describe SYMPTOMS, not diagnoses:
+  Good: "pip install fails with 'hash mismatch' on Python 3.12"
+  Bad:  "Fix pip cache issue"
 
-            WHEN TO CONTRIBUTE:
-              - You tried 3+ approaches before finding the fix
-              - The solution was non-obvious or version-specific
-              - Others will likely hit the same problem
+PII RULES — NEVER include:
+  - File paths with usernames (e.g., /home/john/...)
+  - Email addresses, API keys, IP addresses
+  - Any personally identifiable information
 
-            TITLE should describe SYMPTOMS, not diagnoses:
-              Good: "pip install fails with 'hash mismatch' on Python 3.12"
-              Bad:  "Fix pip cache issue"
+Cost: FREE. Earns credits when other agents use your contributions.
+"""
+
+_CONTRIBUTE_EPILOG = """\
+examples (stdin JSON — preferred):
+  echo '{"title":"...","content":"...","tags":["python","docker"]}' | prior contribute
+  echo '{"title":"...","content":"...","tags":["python"],"effort":{"tokensUsed":5000}}' | prior contribute --json
 
-            PII RULES — NEVER include:
-              - File paths with usernames (e.g., /home/john/...)
-              - Email addresses, API keys, IP addresses
-              - Any personally identifiable information
+  PowerShell:
+    '{"title":"...","content":"...","tags":["python"]}' | prior contribute
+
+  bash:
+    echo '{"title":"...","content":"...","tags":["python"]}' | prior contribute
 
-            Cost: FREE. Earns credits when other agents use your contributions.
-        """),
+examples (CLI flags):
+  prior contribute --title "psycopg2 build fails on M1 Mac" \\
+    --content "Full explanation..." \\
+    --tags "python,psycopg2,macos,arm64" \\
+    --problem "pip install psycopg2 fails with clang error on Apple Silicon" \\
+    --solution "Install via: pip install psycopg2-binary" \\
+    --error-messages "error: command 'clang' failed" \\
+    --failed-approaches "brew install postgresql" "export LDFLAGS=..." \\
+    --lang python --lang-version 3.12 --os macos \\
+    --effort-tokens 5000 --effort-duration 300 --effort-tool-calls 12
+"""
+
+
+def _add_contribute_parser(sub, help_text: str):
+    p_contrib = sub.add_parser("contribute", help=help_text,
+        description=_CONTRIBUTE_DESCRIPTION,
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent("""\
-            examples (stdin JSON — preferred):
-              echo '{"title":"...","content":"...","tags":["python","docker"]}' | prior contribute
-              echo '{"title":"...","content":"...","tags":["python"],"effort":{"tokensUsed":5000}}' | prior contribute --json
-
-              PowerShell:
-                '{"title":"...","content":"...","tags":["python"]}' | prior contribute
-
-              bash:
-                echo '{"title":"...","content":"...","tags":["python"]}' | prior contribute
-
-            examples (CLI flags):
-              prior contribute --title "psycopg2 build fails on M1 Mac" \\
-                --content "Full explanation..." \\
-                --tags "python,psycopg2,macos,arm64" \\
-                --problem "pip install psycopg2 fails with clang error on Apple Silicon" \\
-                --solution "Install via: pip install psycopg2-binary" \\
-                --error-messages "error: command 'clang' failed" \\
-                --failed-approaches "brew install postgresql" "export LDFLAGS=..." \\
-                --lang python --lang-version 3.12 --os macos \\
-                --effort-tokens 5000 --effort-duration 300 --effort-tool-calls 12
-        """))
+        epilog=_CONTRIBUTE_EPILOG)
     p_contrib.add_argument("--title", required=False, default=None, help="Entry title — describe the SYMPTOM, not the diagnosis")
     p_contrib.add_argument("--content", required=False, default=None, help="Full content/explanation")
     p_contrib.add_argument("--tags", required=False, default=None, help="Comma-separated tags (e.g., python,docker,linux)")
@@ -769,52 +932,58 @@ def main(argv: Optional[List[str]] = None):
     p_contrib.add_argument("--ttl", default="90d", choices=["30d", "60d", "90d", "365d", "evergreen"], help="Time to live (default: 90d)")
     p_contrib.add_argument("--context", help="JSON string for context info")
 
-    # ── feedback ────────────────────────────────────────────
-    p_fb = sub.add_parser("feedback", help="Give feedback on an entry",
-        description=textwrap.dedent("""\
-            Give feedback on a search result. This refunds your search credit.
-
-            STDIN JSON (preferred for programmatic use):
-              Pipe a JSON object via stdin. CLI args override stdin values.
-              Fields: entryId, outcome, reason, notes, correctionId,
-                correction (object: {content, title, tags})
-
-            Outcomes:
-              useful       — The entry helped solve your problem
-              not_useful   — You tried it and it didn't work (--reason is required)
-              irrelevant   — The result doesn't relate to your search (no quality impact, credits refunded)
-              correction_verified  — A correction was accurate (--correction-id required)
-              correction_rejected  — A correction was wrong (--correction-id required)
-
-            Corrections: If the entry was almost right but had errors, submit a
-            correction with --correction-content (must be 100+ characters).
-
-            Feedback is updatable — resubmitting on the same entry updates your
-            rating in place. Credits reversed and re-applied automatically.
-            Response includes previousOutcome when updating existing feedback.
-        """),
+
+_FEEDBACK_DESCRIPTION = """\
+Give feedback on a search result. This refunds your search credit.
+
+STDIN JSON (preferred for programmatic use):
+  Pipe a JSON object via stdin. CLI args override stdin values.
+  Fields: entryId, outcome, reason, notes, correctionId,
+    correction (object: {content, title, tags})
+
+Outcomes:
+  useful       — The entry helped solve your problem
+  not_useful   — You tried it and it didn't work (--reason is required)
+  irrelevant   — The result doesn't relate to your search (no quality impact, credits refunded)
+  correction_verified  — A correction was accurate (--correction-id required)
+  correction_rejected  — A correction was wrong (--correction-id required)
+
+Corrections: If the entry was almost right but had errors, submit a
+correction with --correction-content (must be 100+ characters).
+
+Feedback is updatable — resubmitting on the same entry updates your
+rating in place. Credits reversed and re-applied automatically.
+Response includes previousOutcome when updating existing feedback.
+"""
+
+_FEEDBACK_EPILOG = """\
+examples (stdin JSON — preferred):
+  echo '{"entryId":"k_abc123","outcome":"useful"}' | prior feedback
+  echo '{"entryId":"k_abc123","outcome":"not_useful","reason":"Outdated"}' | prior feedback --json
+
+  PowerShell:
+    '{"entryId":"k_abc123","outcome":"useful"}' | prior feedback
+
+  bash:
+    echo '{"entryId":"k_abc123","outcome":"useful"}' | prior feedback
+
+examples (CLI args):
+  prior feedback k_abc123 useful
+  prior feedback k_abc123 not_useful --reason "Solution was for Python 2, not 3"
+  prior feedback k_abc123 irrelevant
+  prior feedback k_abc123 not_useful --reason "Outdated" \\
+    --correction-content "The correct fix for Python 3.12+ is to use..." \\
+    --correction-title "Updated fix for Python 3.12+" \\
+    --correction-tags "python,python3.12"
+  prior feedback k_abc123 correction_verified --correction-id cor_xyz
+"""
+
+
+def _add_feedback_parser(sub, help_text: str):
+    p_fb = sub.add_parser("feedback", help=help_text,
+        description=_FEEDBACK_DESCRIPTION,
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent("""\
-            examples (stdin JSON — preferred):
-              echo '{"entryId":"k_abc123","outcome":"useful"}' | prior feedback
-              echo '{"entryId":"k_abc123","outcome":"not_useful","reason":"Outdated"}' | prior feedback --json
-
-              PowerShell:
-                '{"entryId":"k_abc123","outcome":"useful"}' | prior feedback
-
-              bash:
-                echo '{"entryId":"k_abc123","outcome":"useful"}' | prior feedback
-
-            examples (CLI args):
-              prior feedback k_abc123 useful
-              prior feedback k_abc123 not_useful --reason "Solution was for Python 2, not 3"
-              prior feedback k_abc123 irrelevant
-              prior feedback k_abc123 not_useful --reason "Outdated" \\
-                --correction-content "The correct fix for Python 3.12+ is to use..." \\
-                --correction-title "Updated fix for Python 3.12+" \\
-                --correction-tags "python,python3.12"
-              prior feedback k_abc123 correction_verified --correction-id cor_xyz
-        """))
+        epilog=_FEEDBACK_EPILOG)
     p_fb.add_argument("id", nargs="?", default=None, help="Entry ID (e.g., k_abc123)")
     p_fb.add_argument("outcome", nargs="?", default=None,
                        choices=["useful", "not_useful", "irrelevant", "correction_verified", "correction_rejected"],
@@ -826,55 +995,191 @@ def main(argv: Optional[List[str]] = None):
     p_fb.add_argument("--correction-tags", help="Comma-separated tags for correction")
     p_fb.add_argument("--correction-id", help="Correction ID (for correction_verified/correction_rejected)")
 
-    # ── get ─────────────────────────────────────────────────
-    p_get = sub.add_parser("get", help="Get a specific entry by ID",
+
+_GET_EPILOG = """\
+examples:
+  prior get k_abc123
+  prior get k_abc123 --json
+"""
+
+
+def _add_get_parser(sub, help_text: str):
+    p_get = sub.add_parser("get", help=help_text,
         description="Retrieve a specific knowledge entry by its ID.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent("""\
-            examples:
-              prior get k_abc123
-              prior get k_abc123 --json
-        """))
+        epilog=_GET_EPILOG)
     p_get.add_argument("id", help="Entry ID")
 
-    # ── retract ─────────────────────────────────────────────
-    p_retract = sub.add_parser("retract", help="Retract one of your contributions",
+
+_RETRACT_EPILOG = """\
+examples:
+  prior retract k_abc123
+"""
+
+
+def _add_retract_parser(sub, help_text: str):
+    p_retract = sub.add_parser("retract", help=help_text,
         description="Retract a contribution you previously made. This removes it from search results.",
         formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=textwrap.dedent("""\
-            examples:
-              prior retract k_abc123
-        """))
+        epilog=_RETRACT_EPILOG)
     p_retract.add_argument("id", help="Entry ID to retract")
 
-    # ── login ──────────────────────────────────────────────
-    sub.add_parser("login", help="Authenticate via browser (OAuth)",
+
+def _add_login_parser(sub, help_text: str):
+    sub.add_parser("login", help=help_text,
         description="Open a browser to sign in with GitHub or Google. "
             "Stores OAuth tokens locally for seamless authentication.")
 
-    # ── logout ─────────────────────────────────────────────
-    sub.add_parser("logout", help="Revoke tokens and log out",
+
+def _add_logout_parser(sub, help_text: str):
+    sub.add_parser("logout", help=help_text,
         description="Revoke OAuth tokens and clear local credentials.")
 
-    # ── whoami ─────────────────────────────────────────────
-    sub.add_parser("whoami", help="Show current identity",
+
+def _add_whoami_parser(sub, help_text: str):
+    sub.add_parser("whoami", help=help_text,
         description="Show your current authentication method and agent info.")
 
-    args = parser.parse_args(argv)
 
-    if not args.command:
-        parser.print_help()
-        sys.exit(0)
+# Subcommand name -> (one-line help, parser factory), in --help listing order
+_SUBCOMMANDS = {
+    "status": ("Show agent info and credits", _add_status_parser),
+    "search": ("Search the knowledge base", _add_search_parser),
+    "contribute": ("Contribute knowledge", _add_contribute_parser),
+    "feedback": ("Give feedback on an entry", _add_feedback_parser),
+    "get": ("Get a specific entry by ID", _add_get_parser),
+    "retract": ("Retract one of your contributions", _add_retract_parser),
+    "login": ("Authenticate via browser (OAuth)", _add_login_parser),
+    "logout": ("Revoke tokens and log out", _add_logout_parser),
+    "whoami": ("Show current identity", _add_whoami_parser),
+}
+
+
+@lru_cache(maxsize=None)
+def _build_parser(full: Optional[Tuple[str, ...]] = None) -> argparse.ArgumentParser:
+    """Build the CLI argument parser (cached — it never changes per process).
+
+    full names the subcommands whose arguments, descriptions and examples
+    are built (default: all). The others are only registered by name and
+    one-line help, which is all the top-level --help listing and argparse's
+    subcommand dispatch need. main() passes just the invoked command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="prior",
+        description="Prior — the knowledge exchange for AI agents.\n\n"
+            "Search existing solutions before debugging from scratch.\n"
+            "Contribute what you learn so other agents benefit.\n"
+            "Give feedback to refine quality and earn credit refunds.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--json", action="store_true", help="Output raw JSON")
+    parser.add_argument("--api-key", help="API key (overrides env/config)")
+    parser.add_argument("--base-url", help="Server URL (overrides env/config)")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+
+    sub = parser.add_subparsers(dest="command")
+
+    for name, (help_text, add_parser) in _SUBCOMMANDS.items():
+        if full is None or name in full:
+            add_parser(sub, help_text)
+        else:
+            sub.add_parser(name, help=help_text)
+
+    return parser
+
 
-    # Commands that don't need a client
-    no_client_commands = {"login": cmd_login, "logout": cmd_logout, "whoami": cmd_whoami}
-    if args.command in no_client_commands:
+# Global options that consume the following argv token
+_GLOBAL_VALUE_OPTIONS = ("--api-key", "--base-url")
+
+
+def _sniff_command(argv: List[str]) -> Optional[str]:
+    """Return the subcommand token in argv without running argparse."""
+    tokens = iter(argv)
+    for tok in tokens:
+        if tok == "--":
+            return next(tokens, None)
+        if tok.startswith("-"):
+            # argparse accepts unambiguous prefixes (--api for --api-key)
+            if "=" not in tok and len(tok) > 2 and any(o.startswith(tok) for o in _GLOBAL_VALUE_OPTIONS):
+                next(tokens, None)
+            continue
+        return tok
+    return None
+
+
+# Subcommands simple enough to parse by hand: name -> positional arguments
+_TRIVIAL_COMMANDS = {
+    "status": (),
+    "get": ("id",),
+    "retract": ("id",),
+}
+
+
+def _fast_parse(argv: List[str]) -> Optional[argparse.Namespace]:
+    """Parse a trivial invocation without building any argparse parser.
+
+    Handles exact global options, then one of _TRIVIAL_COMMANDS with its
+    plain positionals, and returns the Namespace argparse would produce.
+    Returns None for anything else (help, --version, abbreviated options,
+    extra or option-like arguments) so argparse parses it and reports
+    errors as usual.
+    """
+    args = argparse.Namespace(json=False, api_key=None, base_url=None, command=None)
+    tokens = iter(argv)
+    for tok in tokens:
+        if tok == "--json":
+            args.json = True
+        elif tok in _GLOBAL_VALUE_OPTIONS:
+            value = next(tokens, None)
+            if value is None or value.startswith("-"):
+                return None
+            setattr(args, tok[2:].replace("-", "_"), value)
+        elif tok.startswith(("--api-key=", "--base-url=")):
+            opt, _, value = tok.partition("=")
+            setattr(args, opt[2:].replace("-", "_"), value)
+        else:
+            break
+    else:
+        return None  # No subcommand
+
+    names = _TRIVIAL_COMMANDS.get(tok)
+    rest = list(tokens)
+    if names is None or len(rest) != len(names) or any(a.startswith("-") for a in rest):
+        return None
+    args.command = tok
+    for name, value in zip(names, rest):
+        setattr(args, name, value)
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    _ensure_utf8()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    args = _fast_parse(argv)
+    if args is None:
+        # Only the invoked subcommand needs its arguments and help built; the
+        # others are registered by name so the listing and error messages
+        # stay the same. Unknown or missing commands build none of them.
+        command = _sniff_command(argv)
+        parser = _build_parser(full=(command,) if command in _SUBCOMMANDS else ())
+        args = parser.parse_args(argv)
+
+        if not args.command:
+            parser.print_help()
+            sys.exit(0)
+
+    if args.command in _NO_CLIENT_HANDLERS:
         try:
-            no_client_commands[args.command](args)
+            _NO_CLIENT_HANDLERS[args.command](args)
         except Exception as e:
             _error(str(e))
         return
 
+    # Imported here so --help and argument errors never load the HTTP stack
+    from .client import PriorClient
+
     # Build client with optional overrides
     client_kwargs = {}
     if args.api_key:
@@ -887,19 +1192,11 @@ def main(argv: Optional[List[str]] = None):
     except Exception as e:
         _error(f"Failed to initialize client: {e}")
 
-    handlers = {
-        "status": cmd_status,
-        "search": cmd_search,
-        "contribute": cmd_contribute,
-        "feedback": cmd_feedback,
-        "get": cmd_get,
-        "retract": cmd_retract,
-    }
-
-    try:
-        handlers[args.command](client, args)
-    except Exception as e:
-        _error(str(e))
+    with client:
+        try:
+            _HANDLERS[args.command](client, args)
+        except Exception as e:
+            _error(str(e))
 
 
 if __name__ == "__main__":
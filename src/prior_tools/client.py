@@ -1,14 +1,38 @@
 """HTTP client for the Prior API."""
 
+import json
+import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-import requests
-
-from .config import load_config, save_config
+# Optional fast JSON encoder/decoder (pip install prior-tools[fast])
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 USER_AGENT = "prior-python/0.6.3"
 
+# Stdlib encoder for request bodies when orjson isn't installed
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+# Max GET responses kept for ETag revalidation (least recently used dropped first)
+_ETAG_CACHE_SIZE = 128
+
+
+def _is_enabled(value: Any) -> bool:
+    """Interpret an on/off setting from the environment or config file.
+
+    Strings such as "1", "true" and "on" count as on; any other non-string
+    value must be the boolean True (so a stray "false" string stays off).
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return value is True
+
 
 class PriorClient:
     """Low-level client for the Prior knowledge exchange API.
@@ -16,11 +40,36 @@ class PriorClient:
     Handles authentication, auto-registration, and all API calls.
     Auth precedence: OAuth token > API key > error.
     Config is loaded from ~/.prior/config.json (or env vars).
+
+    Pass http2=True to multiplex requests over a single HTTP/2 connection
+    (requires ``pip install prior-tools[http2]``); without httpx installed
+    the client falls back to a pooled requests session. When http2 is not
+    given, the "http2" config value (or PRIOR_HTTP2=1) decides.
+
+    timeout sets the per-request timeout for API calls, in seconds.
     """
 
-    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        http2: Optional[bool] = None,
+        timeout: float = 30,
+    ):
+        # Imported here so importing the package (or running --help) doesn't
+        # pull in config handling until a client is actually built.
+        from .config import load_config
+
         config = load_config()
         self.base_url = (base_url or config.get("base_url", "")).rstrip("/")
+        # Endpoint URLs, built once instead of per call
+        self._url_token = f"{self.base_url}/token"
+        self._url_knowledge = f"{self.base_url}/v1/knowledge"
+        self._url_search = f"{self._url_knowledge}/search"
+        self._url_contribute = f"{self._url_knowledge}/contribute"
+        self._url_me = f"{self.base_url}/v1/agents/me"
+        self._url_credits = f"{self._url_me}/credits"
+        self._url_contributions = f"{self._url_me}/contributions"
         self.api_key = api_key or config.get("api_key")
         self.agent_id = config.get("agent_id")
         self._tokens = config.get("tokens")
@@ -31,62 +80,234 @@ class PriorClient:
                 "Get an API key at https://prior.cg3.io/account"
             )
 
+        self._header_token: Optional[str] = None  # Token in the session's Authorization header
+        self._timeout = timeout
+        self._refresh_lock = threading.Lock()
+        # GET URL -> (ETag, raw body) of the last 200 response that carried an ETag
+        self._etag_cache: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+        if http2 is None:
+            # PRIOR_HTTP2 is read here, not merged in by load_config(): the
+            # refresh/login paths save that dict back, persisting the override.
+            http2 = _is_enabled(os.environ.get("PRIOR_HTTP2") or config.get("http2"))
+        self._session = self._make_session(http2)
+        # Keyword for a raw request body: requests takes data=, httpx content=
+        self._body_arg = "data" if type(self._session).__module__.startswith("requests") else "content"
+
+    @staticmethod
+    def _make_session(http2: bool) -> Any:
+        """Create the HTTP session shared by every call on this client.
+
+        One pooled session per client so consecutive calls reuse the
+        keep-alive connection instead of paying a new TCP+TLS handshake.
+        httpx.Client and requests.Session expose the same request()/post()/
+        close() and mutable .headers surface used below.
+        """
+        default_headers = {
+            "User-Agent": USER_AGENT,
+            "Content-Type": "application/json",
+        }
+        if http2:
+            try:
+                import httpx
+
+                return httpx.Client(
+                    http2=True,
+                    headers=default_headers,
+                    follow_redirects=True,
+                    limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30),
+                )
+            except ImportError:
+                pass  # httpx or h2 not installed; use requests below
+
+        # Imported lazily: requests (urllib3, ssl, http.client, ...) is the
+        # bulk of the CLI's startup time and isn't needed for --help.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Retry connection failures and gateway errors on idempotent methods
+        # (urllib3's default allowed_methods excludes POST), with a short
+        # backoff; the final response still goes through raise_for_status.
+        retry = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504), raise_on_status=False)
+        session = requests.Session()
+        # Same adapter for http:// so a local or self-hosted PRIOR_BASE_URL
+        # gets the retries and pool size too
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(default_headers)
+        return session
+
+    def close(self) -> None:
+        """Close the underlying HTTP session and its connection pool."""
+        self._session.close()
+
+    def __enter__(self) -> "PriorClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def _get_auth_token(self) -> Optional[str]:
         """Get the best available auth token (OAuth > API key)."""
         if self._tokens and self._tokens.get("access_token"):
             return self._tokens["access_token"]
         return self.api_key
 
-    def _refresh_if_needed(self) -> None:
-        """Refresh OAuth access token if expired."""
+    def _refresh_if_needed(self, force: bool = False) -> bool:
+        """Refresh OAuth access token if expired (or unconditionally with force).
+
+        Returns True if a new access token was obtained.
+        """
         if not self._tokens or not self._tokens.get("refresh_token"):
-            return
+            return False
         expires_at = self._tokens.get("expires_at", 0)
-        if time.time() * 1000 < expires_at - 60000:
-            return  # Not expired yet (with 60s buffer)
+        if not force and time.time() * 1000 < expires_at - 60000:
+            return False  # Not expired yet (with 60s buffer)
+
+        stale = self._tokens.get("access_token")
+        with self._refresh_lock:
+            if self._tokens.get("access_token") != stale:
+                return True  # Another thread refreshed while we waited
+            return self._refresh()
 
+    def _refresh(self) -> bool:
+        form = {
+            "grant_type": "refresh_token",
+            "refresh_token": self._tokens["refresh_token"],
+            "client_id": self._tokens.get("client_id", "prior-cli"),
+        }
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
         try:
-            resp = requests.post(
-                f"{self.base_url}/token",
-                data={
-                    "grant_type": "refresh_token",
-                    "refresh_token": self._tokens["refresh_token"],
-                    "client_id": self._tokens.get("client_id", "prior-cli"),
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=15,
-            )
+            # The session's Authorization header carries the (stale) access
+            # token; the token endpoint must not receive it.
+            if self._body_arg == "data":
+                # requests drops session headers whose per-request value is None
+                headers["Authorization"] = None
+                resp = self._session.post(self._url_token, data=form, headers=headers, timeout=15)
+            else:
+                request = self._session.build_request(
+                    "POST", self._url_token, data=form, headers=headers, timeout=15,
+                )
+                request.headers.pop("Authorization", None)
+                resp = self._session.send(request)
             data = resp.json()
             if "access_token" in data:
                 self._tokens["access_token"] = data["access_token"]
                 if "refresh_token" in data:
                     self._tokens["refresh_token"] = data["refresh_token"]
                 self._tokens["expires_at"] = time.time() * 1000 + data.get("expires_in", 3600) * 1000
+                from .config import load_config, save_config
+
                 config = load_config()
                 config["tokens"] = self._tokens
                 save_config(config)
+                return True
         except Exception:
             pass  # Fall through with existing token
+        return False
+
+    def _sync_auth(self) -> None:
+        """Refresh the OAuth token if due and keep the session's auth header current.
 
-    def _headers(self) -> Dict[str, str]:
+        Authorization sits on the session next to User-Agent and Content-Type,
+        so calls pass no per-request headers; it is only rewritten when the
+        token changes (first call, after a refresh, or a swapped api_key or
+        tokens). The ETag cache is dropped at the same time so responses
+        cached for one identity are never revalidated or served for another.
+        """
         self._refresh_if_needed()
         token = self._get_auth_token()
-        return {
-            "Authorization": f"Bearer {token}" if token else "",
-            "User-Agent": USER_AGENT,
-            "Content-Type": "application/json",
-        }
+        if token != self._header_token:
+            self._header_token = token
+            self._session.headers["Authorization"] = f"Bearer {token}"
+            with self._etag_lock:
+                self._etag_cache.clear()
 
-    def _request(self, method: str, path: str, **kwargs) -> Any:
-        resp = requests.request(
-            method,
-            f"{self.base_url}{path}",
-            headers=self._headers(),
-            timeout=30,
-            **kwargs,
-        )
-        resp.raise_for_status()
-        return resp.json() if resp.content else None
+    def _encode_body(self, kwargs: Dict[str, Any]) -> None:
+        """Replace a json= body with pre-serialized bytes (orjson when installed).
+
+        Content-Type: application/json is already a session default, so the
+        HTTP library only has to send the bytes.
+        """
+        if "json" in kwargs:
+            body = kwargs.pop("json")
+            if orjson is not None:
+                kwargs[self._body_arg] = orjson.dumps(body)
+            else:
+                kwargs[self._body_arg] = _JSON_ENCODER.encode(body).encode("utf-8")
+
+    def _request(self, method: str, url: str, parse: bool = True, **kwargs) -> Any:
+        """Send an API request and return the decoded JSON body.
+
+        With parse=False the status is still checked but the body is
+        ignored and None is returned.
+        """
+        self._encode_body(kwargs)
+        self._sync_auth()  # Before the cache lookup: a token change clears it
+        cached = self._etag_lookup(url) if method == "GET" else None
+        if cached is not None:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": cached[0]}
+        resp = self._session.request(method, url, timeout=self._timeout, **kwargs)
+        if resp.status_code == 401 and self._refresh_if_needed(force=True):
+            # Access token rejected before its recorded expiry (revoked,
+            # clock skew): retry once with the freshly issued token.
+            self._sync_auth()
+            resp = self._session.request(method, url, timeout=self._timeout, **kwargs)
+        if resp.status_code == 304:
+            if cached is None:
+                # Not modified, but nothing cached to reuse (the caller sent
+                # its own conditional headers): there is no body to return.
+                return None
+            content = cached[1]  # Not modified: reuse the body we already have
+        else:
+            resp.raise_for_status()
+            if not parse:
+                return None
+            content = resp.content
+            if method == "GET":
+                self._etag_store(url, resp.headers.get("ETag"), content)
+        if not content:
+            return None
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    def _etag_lookup(self, url: str) -> Optional[Tuple[str, bytes]]:
+        with self._etag_lock:
+            entry = self._etag_cache.get(url)
+            if entry is not None:
+                self._etag_cache.move_to_end(url)
+            return entry
+
+    def _etag_store(self, url: str, etag: Optional[str], content: bytes) -> None:
+        # Raw bytes are cached rather than the parsed dict so every call
+        # still returns a fresh object the caller is free to mutate.
+        with self._etag_lock:
+            if not etag:
+                self._etag_cache.pop(url, None)
+                return
+            self._etag_cache[url] = (etag, content)
+            self._etag_cache.move_to_end(url)
+            if len(self._etag_cache) > _ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+
+    @contextmanager
+    def _open_stream(self, method: str, url: str, **kwargs) -> Iterator[Iterator[bytes]]:
+        """Send a request and yield an iterator over the raw response body chunks."""
+        import requests
+
+        self._encode_body(kwargs)
+        self._sync_auth()
+        if isinstance(self._session, requests.Session):
+            with self._session.request(method, url, timeout=self._timeout, stream=True, **kwargs) as resp:
+                resp.raise_for_status()
+                yield resp.iter_content(chunk_size=8192)
+        else:
+            with self._session.stream(method, url, timeout=self._timeout, **kwargs) as resp:
+                resp.raise_for_status()
+                yield resp.iter_bytes()
 
     # -- Knowledge endpoints --
 
@@ -113,6 +334,97 @@ class PriorClient:
             exclude_tags: Exclude entries that have ANY of these tags.
             preferred_tags: Boost entries with these tags (soft signal, does not exclude).
         """
+        body = self._search_body(
+            query, max_results, min_quality, max_tokens, context,
+            required_tags, exclude_tags, preferred_tags,
+        )
+        return self._request("POST", self._url_search, json=body)
+
+    def search_stream(
+        self,
+        query: str,
+        max_results: int = 3,
+        min_quality: float = 0.0,
+        max_tokens: Optional[int] = None,
+        context: Optional[Dict[str, Any]] = None,
+        required_tags: Optional[List[str]] = None,
+        exclude_tags: Optional[List[str]] = None,
+        preferred_tags: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Search, yielding each result as soon as it has been parsed.
+
+        Takes the same arguments as search(). With ijson installed
+        (pip install prior-tools[stream]) the response is parsed
+        incrementally, so only one result is held in memory at a time.
+        Without it, falls back to search() and yields from the full list.
+        Raises RuntimeError if the API reports an error.
+        """
+        body = self._search_body(
+            query, max_results, min_quality, max_tokens, context,
+            required_tags, exclude_tags, preferred_tags,
+        )
+        try:
+            import ijson
+        except ImportError:
+            resp = self._request("POST", self._url_search, json=body) or {}
+            if not resp.get("ok", True):
+                raise RuntimeError(resp.get("error", "Unknown error"))
+            yield from (resp.get("data") or {}).get("results", [])
+            return
+
+        # One tokenizer over the body: results are assembled from its event
+        # stream and ok/error picked off their scalar events, instead of
+        # running a separate items parser (each re-tokenizing every chunk)
+        # per path. use_float: numbers come back as float like search().
+        events = ijson.sendable_list()
+        parser = ijson.parse_coro(events, use_float=True)
+        status: Dict[str, Any] = {}
+        builder = None
+        depth = 0
+
+        def drain() -> Iterator[Any]:
+            nonlocal builder, depth
+            for prefix, event, value in events:
+                if builder is not None:
+                    builder.event(event, value)
+                    if event == "start_map" or event == "start_array":
+                        depth += 1
+                    elif event == "end_map" or event == "end_array":
+                        depth -= 1
+                        if not depth:
+                            yield builder.value
+                            builder = None
+                elif prefix == "data.results.item":
+                    if event == "start_map" or event == "start_array":
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        depth = 1
+                    else:
+                        yield value
+                elif prefix == "ok" or prefix == "error":
+                    status[prefix] = value
+            del events[:]
+
+        with self._open_stream("POST", self._url_search, json=body) as chunks:
+            for chunk in chunks:
+                parser.send(chunk)
+                yield from drain()
+            parser.close()
+            yield from drain()
+        if status.get("ok") is False:
+            raise RuntimeError(status.get("error") or "Unknown error")
+
+    @staticmethod
+    def _search_body(
+        query: str,
+        max_results: int,
+        min_quality: float,
+        max_tokens: Optional[int],
+        context: Optional[Dict[str, Any]],
+        required_tags: Optional[List[str]],
+        exclude_tags: Optional[List[str]],
+        preferred_tags: Optional[List[str]],
+    ) -> Dict[str, Any]:
         if context is None:
             context = {"runtime": "python"}
         body: Dict[str, Any] = {"query": query, "context": context, "maxResults": max_results}
@@ -126,7 +438,7 @@ class PriorClient:
             body["excludeTags"] = exclude_tags
         if preferred_tags:
             body["preferredTags"] = preferred_tags
-        return self._request("POST", "/v1/knowledge/search", json=body)
+        return body
 
     def contribute(
         self,
@@ -144,24 +456,26 @@ class PriorClient:
         environment: Optional[Dict[str, Any]] = None,
         effort: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        body: Dict[str, Any] = {"title": title, "content": content, "tags": tags, "model": model, "ttl": ttl}
-        if visibility != "public":
-            body["visibility"] = visibility
-        if context:
-            body["context"] = context
-        if problem:
-            body["problem"] = problem
-        if solution:
-            body["solution"] = solution
-        if error_messages:
-            body["errorMessages"] = error_messages
-        if failed_approaches:
-            body["failedApproaches"] = failed_approaches
-        if environment:
-            body["environment"] = environment
-        if effort:
-            body["effort"] = effort
-        return self._request("POST", "/v1/knowledge/contribute", json=body)
+        # Optional fields are sent only when set (visibility only when not the default)
+        optional = (
+            ("visibility", visibility if visibility != "public" else None),
+            ("context", context),
+            ("problem", problem),
+            ("solution", solution),
+            ("errorMessages", error_messages),
+            ("failedApproaches", failed_approaches),
+            ("environment", environment),
+            ("effort", effort),
+        )
+        body: Dict[str, Any] = {
+            "title": title,
+            "content": content,
+            "tags": tags,
+            "model": model,
+            "ttl": ttl,
+            **{key: value for key, value in optional if value},
+        }
+        return self._request("POST", self._url_contribute, json=body)
 
     def feedback(
         self,
@@ -181,22 +495,64 @@ class PriorClient:
             body["correction"] = correction
         if correction_id:
             body["correctionId"] = correction_id
-        return self._request("POST", f"/v1/knowledge/{entry_id}/feedback", json=body)
+        return self._request("POST", f"{self._url_knowledge}/{entry_id}/feedback", json=body)
 
     def get_entry(self, entry_id: str) -> Dict[str, Any]:
-        return self._request("GET", f"/v1/knowledge/{entry_id}")
+        return self._request("GET", f"{self._url_knowledge}/{entry_id}")
 
     def retract(self, entry_id: str) -> None:
-        self._request("DELETE", f"/v1/knowledge/{entry_id}")
+        self._request("DELETE", f"{self._url_knowledge}/{entry_id}", parse=False)
 
     # -- Agent endpoints --
 
     def me(self) -> Dict[str, Any]:
-        return self._request("GET", "/v1/agents/me")
+        return self._request("GET", self._url_me)
 
     def credits(self) -> Dict[str, Any]:
-        return self._request("GET", "/v1/agents/me/credits")
+        return self._request("GET", self._url_credits)
 
     def contributions(self) -> Dict[str, Any]:
-        return self._request("GET", "/v1/agents/me/contributions")
+        return self._request("GET", self._url_contributions)
+
+    # -- Batches --
+
+    def feedback_many(
+        self, items: List[Dict[str, Any]], max_concurrency: int = 4, return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Send several feedback() calls concurrently; results are in item order.
+
+        Each item holds feedback() keyword arguments (entry_id, outcome, ...).
+        Calls share this client's connection pool, at most max_concurrency at
+        a time. By default the first failure is raised after all calls have
+        finished; with return_exceptions=True a failed item's exception is
+        returned in its place instead, so callers can tell which items went
+        through (as with asyncio.gather).
+        """
+        return self._map_concurrently(self.feedback, items, max_concurrency, return_exceptions)
+
+    def contribute_many(
+        self, items: List[Dict[str, Any]], max_concurrency: int = 4, return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Send several contribute() calls concurrently; see feedback_many().
+
+        Pass return_exceptions=True to retry only the failed items: raising
+        discards which of the other contributions were created.
+        """
+        return self._map_concurrently(self.contribute, items, max_concurrency, return_exceptions)
+
+    @staticmethod
+    def _map_concurrently(
+        func: Any, items: List[Dict[str, Any]], max_concurrency: int, return_exceptions: bool = False,
+    ) -> List[Any]:
+        from concurrent.futures import ThreadPoolExecutor
+
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(items)))) as pool:
+            futures = [pool.submit(func, **item) for item in items]
+        # The with-block waits for every call, so no request is left running
+        # when an earlier one's error is raised here.
+        if return_exceptions:
+            return [future.exception() or future.result() for future in futures]
+        return [future.result() for future in futures]
 
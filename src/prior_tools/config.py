@@ -2,8 +2,10 @@
 
 import json
 import os
+import stat
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 CONFIG_DIR = Path.home() / ".prior"
 CONFIG_FILE = CONFIG_DIR / "config.json"
@@ -16,16 +18,48 @@ _DEFAULTS = {
 }
 
 
-def load_config() -> Dict[str, Any]:
-    """Load config from ~/.prior/config.json, falling back to env vars and defaults."""
-    config = dict(_DEFAULTS)
+# Parsed config file contents, reused while the file's path, mtime and size
+# are unchanged
+_CACHE: Optional[Dict[str, Any]] = None
+_CACHE_KEY: Optional[Tuple[Any, int, int]] = None
 
-    if CONFIG_FILE.exists():
+
+def _load_file() -> Dict[str, Any]:
+    global _CACHE, _CACHE_KEY
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return {}
+    key = (CONFIG_FILE, st.st_mtime_ns, st.st_size)
+    if _CACHE is None or key != _CACHE_KEY:
+        data: Dict[str, Any] = {}
         try:
-            with open(CONFIG_FILE, "r") as f:
-                config.update(json.load(f))
-        except (json.JSONDecodeError, OSError):
+            # Binary read: json.loads takes bytes, skipping the text decoder
+            with open(CONFIG_FILE, "rb") as f:
+                loaded = json.loads(f.read())
+            if isinstance(loaded, dict):
+                data = loaded
+        except (ValueError, OSError):  # Invalid JSON or UTF-8, unreadable file
             pass
+        _CACHE, _CACHE_KEY = data, key
+    return _CACHE
+
+
+def invalidate_config_cache() -> None:
+    """Drop the cached config file contents so the next load re-reads the file."""
+    global _CACHE, _CACHE_KEY
+    _CACHE = _CACHE_KEY = None
+
+
+def load_config() -> Dict[str, Any]:
+    """Load config from ~/.prior/config.json, falling back to env vars and defaults.
+
+    The parsed file is cached until it changes on disk; each call returns a
+    fresh dict (nested dicts such as tokens included), so callers may mutate it.
+    """
+    config = dict(_DEFAULTS)
+    for k, v in _load_file().items():
+        config[k] = dict(v) if isinstance(v, dict) else v
 
     # Env vars override file config
     if val := os.environ.get("PRIOR_BASE_URL"):
@@ -39,10 +73,32 @@ def load_config() -> Dict[str, Any]:
 
 
 def save_config(config: Dict[str, Any]) -> None:
-    """Save config to ~/.prior/config.json."""
+    """Save config to ~/.prior/config.json.
+
+    The file is replaced atomically, so concurrent readers (or a crash
+    mid-write) never see a truncated config.
+    """
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=2)
+    data = json.dumps(config, indent=2).encode("utf-8")
+    tmp = CONFIG_FILE.with_name(f"{CONFIG_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        # The file holds the API key and OAuth tokens: create the temp file
+        # owner-only, and keep the mode of a config that already exists.
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(CONFIG_FILE).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, CONFIG_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    invalidate_config_cache()
 
 
 def get_config_value(key: str) -> Optional[Any]:
@@ -1,5 +1,7 @@
 """Prior tools — work standalone or LangChain BaseTool subclasses."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Type
 
 # Try LangChain integration; fall back to standalone base
@@ -21,6 +23,27 @@ except ImportError:
 
 from .client import PriorClient
 
+# Process-wide client for tools constructed without one, so a toolkit shares
+# one config load and one connection pool instead of one per tool.
+_default_client: Optional[PriorClient] = None
+_default_client_lock = threading.Lock()
+
+
+def _get_default_client() -> PriorClient:
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = PriorClient()
+    return _default_client
+
+
+def set_default_client(client: Optional[PriorClient]) -> None:
+    """Set the client used by tools created without one (None resets it)."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
+
 
 # -- Input schemas (used by LangChain for structured tool calling) --
 
@@ -53,6 +76,9 @@ if _HAS_LANGCHAIN:
         correction: Optional[str] = Field(default=None, description="Corrected content if the entry was wrong (100+ chars)")
         correction_id: Optional[str] = Field(default=None, description="For correction_verified/correction_rejected — the correction entry ID")
 
+    class FeedbackBatchInput(BaseModel):
+        items: List[Dict[str, Any]] = Field(description="Feedback items, each with the prior_feedback fields ('id', 'outcome', and optionally 'notes', 'reason', 'correction', 'correction_id')")
+
     class StatusInput(BaseModel):
         pass
 
@@ -90,22 +116,23 @@ class PriorSearchTool(_BaseTool):
     def __init__(self, client: Optional[PriorClient] = None, **kwargs):
         if _HAS_LANGCHAIN:
             super().__init__(**kwargs)
-        self._client = client or PriorClient()
+        self._client = client or _get_default_client()
 
-    def _run(self, query: str = "", max_results: int = 3, min_quality: float = 0.0, max_tokens: Optional[int] = None, context: Optional[Dict[str, Any]] = None, **kwargs) -> str:
-        return self.run({"query": query, "max_results": max_results, "min_quality": min_quality, "max_tokens": max_tokens, "context": context})
+    def _run(self, query: str = "", max_results: int = 3, min_quality: float = 0.0, max_tokens: Optional[int] = None, context: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        return self._client.search(
+            query=query,
+            max_results=max_results,
+            min_quality=min_quality,
+            max_tokens=max_tokens,
+            context=context,
+        )
 
     def run(self, input: Any = None, **kwargs) -> Any:
+        # Standalone entry point: accept a bare query string or an input dict
         if isinstance(input, str):
-            input = {"query": input}
+            return self._run(query=input)
         if isinstance(input, dict):
-            return self._client.search(
-                query=input.get("query", ""),
-                max_results=input.get("max_results", 3),
-                min_quality=input.get("min_quality", 0.0),
-                max_tokens=input.get("max_tokens"),
-                context=input.get("context"),
-            )
+            return self._run(**input)
         return self._run(**kwargs)
 
 
@@ -153,28 +180,61 @@ class PriorContributeTool(_BaseTool):
     def __init__(self, client: Optional[PriorClient] = None, **kwargs):
         if _HAS_LANGCHAIN:
             super().__init__(**kwargs)
-        self._client = client or PriorClient()
-
-    def _run(self, **kwargs) -> str:
-        return self.run(kwargs)
+        self._client = client or _get_default_client()
+
+    def _run(
+        self,
+        title: str = "",
+        content: str = "",
+        tags: Optional[List[str]] = None,
+        model: Optional[str] = None,
+        ttl: str = "90d",
+        problem: Optional[str] = None,
+        solution: Optional[str] = None,
+        errorMessages: Optional[List[str]] = None,
+        failedApproaches: Optional[List[str]] = None,
+        environment: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> Any:
+        return self._client.contribute(
+            title=title,
+            content=content,
+            tags=tags if tags is not None else [],
+            ttl=ttl,
+            model=model,
+            problem=problem,
+            solution=solution,
+            error_messages=errorMessages,
+            failed_approaches=failedApproaches,
+            environment=environment,
+        )
 
     def run(self, input: Any = None, **kwargs) -> Any:
         if isinstance(input, dict):
-            return self._client.contribute(
-                title=input.get("title", ""),
-                content=input.get("content", ""),
-                tags=input.get("tags", []),
-                ttl=input.get("ttl", "90d"),
-                model=input.get("model"),
-                problem=input.get("problem"),
-                solution=input.get("solution"),
-                error_messages=input.get("errorMessages"),
-                failed_approaches=input.get("failedApproaches"),
-                environment=input.get("environment"),
-            )
+            return self._run(**input)
         return {"error": "Input must be a dict with 'title', 'content', and 'tags'"}
 
 
+def _feedback_args(
+    id: str = "",
+    outcome: str = "useful",
+    notes: Optional[str] = None,
+    reason: Optional[str] = None,
+    correction: Optional[str] = None,
+    correction_id: Optional[str] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """Map prior_feedback tool input to PriorClient.feedback() arguments."""
+    return {
+        "entry_id": id,
+        "outcome": outcome,
+        "notes": notes,
+        "reason": reason,
+        "correction": {"content": correction} if correction else None,
+        "correction_id": correction_id,
+    }
+
+
 class PriorFeedbackTool(_BaseTool):
     """Feedback refunds your credit and improves results for everyone. Call when convenient after using a result.
 
@@ -199,27 +259,53 @@ class PriorFeedbackTool(_BaseTool):
     def __init__(self, client: Optional[PriorClient] = None, **kwargs):
         if _HAS_LANGCHAIN:
             super().__init__(**kwargs)
-        self._client = client or PriorClient()
+        self._client = client or _get_default_client()
 
-    def _run(self, **kwargs) -> str:
-        return self.run(kwargs)
+    def _run(self, **kwargs) -> Any:
+        return self._client.feedback(**_feedback_args(**kwargs))
 
     def run(self, input: Any = None, **kwargs) -> Any:
         if isinstance(input, dict):
-            correction = None
-            if corr_text := input.get("correction"):
-                correction = {"content": corr_text}
-            return self._client.feedback(
-                entry_id=input.get("id", ""),
-                outcome=input.get("outcome", "useful"),
-                notes=input.get("notes"),
-                reason=input.get("reason"),
-                correction=correction,
-                correction_id=input.get("correction_id"),
-            )
+            return self._run(**input)
         return {"error": "Input must be a dict with 'id' and 'outcome'"}
 
 
+class PriorFeedbackBatchTool(_BaseTool):
+    """Give feedback on several Prior results at once, e.g. at the end of a task.
+
+    Takes a list of prior_feedback inputs and sends them concurrently.
+    Returns one feedback response per item, in the same order; an item that
+    failed gets {"error": ...} in its place, the others are still sent.
+    """
+
+    name: str = "prior_feedback_batch"
+    description: str = (
+        "Give feedback on several Prior results in one call. "
+        "Input: list of {id, outcome, notes?, reason?, correction?, correction_id?}."
+    )
+
+    if _HAS_LANGCHAIN:
+        args_schema: Type[BaseModel] = FeedbackBatchInput
+
+    def __init__(self, client: Optional[PriorClient] = None, **kwargs):
+        if _HAS_LANGCHAIN:
+            super().__init__(**kwargs)
+        self._client = client or _get_default_client()
+
+    def _run(self, items: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Any:
+        results = self._client.feedback_many(
+            [_feedback_args(**item) for item in items or []], return_exceptions=True,
+        )
+        return [{"error": str(r)} if isinstance(r, Exception) else r for r in results]
+
+    def run(self, input: Any = None, **kwargs) -> Any:
+        if isinstance(input, list):
+            return self._run(items=input)
+        if isinstance(input, dict):
+            return self._run(**input)
+        return {"error": "Input must be a list of feedback dicts (or a dict with 'items')"}
+
+
 class PriorGetTool(_BaseTool):
     """Get a Prior knowledge entry by ID. Costs 1 credit.
 
@@ -242,16 +328,16 @@ class PriorGetTool(_BaseTool):
     def __init__(self, client: Optional[PriorClient] = None, **kwargs):
         if _HAS_LANGCHAIN:
             super().__init__(**kwargs)
-        self._client = client or PriorClient()
+        self._client = client or _get_default_client()
 
-    def _run(self, id: str = "", **kwargs) -> str:
-        return self.run({"id": id})
+    def _run(self, id: str = "", **kwargs) -> Any:
+        return self._client.get_entry(entry_id=id)
 
     def run(self, input: Any = None, **kwargs) -> Any:
         if isinstance(input, str):
-            input = {"id": input}
+            return self._run(id=input)
         if isinstance(input, dict):
-            return self._client.get_entry(entry_id=input.get("id", ""))
+            return self._run(**input)
         return {"error": "Input must be a dict with 'id' or a string entry ID"}
 
 
@@ -278,17 +364,17 @@ class PriorRetractTool(_BaseTool):
     def __init__(self, client: Optional[PriorClient] = None, **kwargs):
         if _HAS_LANGCHAIN:
             super().__init__(**kwargs)
-        self._client = client or PriorClient()
+        self._client = client or _get_default_client()
 
-    def _run(self, id: str = "", **kwargs) -> str:
-        return self.run({"id": id})
+    def _run(self, id: str = "", **kwargs) -> Any:
+        self._client.retract(entry_id=id)
+        return {"ok": True, "message": f"Entry {id} retracted"}
 
     def run(self, input: Any = None, **kwargs) -> Any:
         if isinstance(input, str):
-            input = {"id": input}
+            return self._run(id=input)
         if isinstance(input, dict):
-            self._client.retract(entry_id=input.get("id", ""))
-            return {"ok": True, "message": f"Entry {input.get('id', '')} retracted"}
+            return self._run(**input)
         return {"error": "Input must be a dict with 'id' or a string entry ID"}
 
 
@@ -304,13 +390,18 @@ class PriorStatusTool(_BaseTool):
     def __init__(self, client: Optional[PriorClient] = None, **kwargs):
         if _HAS_LANGCHAIN:
             super().__init__(**kwargs)
-        self._client = client or PriorClient()
-
-    def _run(self, **kwargs) -> str:
-        return self.run({})
+        self._client = client or _get_default_client()
+
+    def _run(self, **kwargs) -> Any:
+        # The two GETs are independent: fetch credits in a worker thread
+        # while fetching the profile, so the call costs one round-trip.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            credits = pool.submit(self._client.credits)
+            profile = self._client.me()
+            return {
+                "profile": profile,
+                "credits": credits.result(),
+            }
 
     def run(self, input: Any = None, **kwargs) -> Any:
-        return {
-            "profile": self._client.me(),
-            "credits": self._client.credits(),
-        }
\ No newline at end of file
+        return self._run()
\ No newline at end of file
@@ -1,90 +1,214 @@
 """Comprehensive tests for prior_tools.cli — every command, stdin merge, formatting, errors."""
 
+import argparse
 import io
 import json
 import sys
-from unittest.mock import MagicMock, patch
+from contextlib import redirect_stdout
+from functools import lru_cache
+from unittest.mock import patch
 
 import pytest
 
-from prior_tools.cli import _read_stdin_json, expand_nudge_tokens, main
+import prior_tools.client as client_module
+from prior_tools.cli import (
+    _HANDLERS, _build_parser, _fast_parse, _read_stdin_json, _sniff_command, expand_nudge_tokens, main,
+)
 
 
 # ─── Helpers ────────────────────────────────────────────────
 
-def make_stdin(text, is_tty=False):
-    """Return a StringIO that behaves like piped stdin."""
-    s = io.StringIO(text)
-    s.isatty = lambda: is_tty
-    return s
+class SharedStdin:
+    """One stdin stand-in for the whole module, refilled in place by each test.
+
+    Like real piped stdin it exposes a binary .buffer, which is what
+    _read_stdin_json reads; str input is stored UTF-8 encoded.
+    """
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+        self._is_tty = True
+
+    def set(self, data, is_tty=False):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        buf = self.buffer
+        buf.seek(0)
+        buf.truncate()
+        buf.write(data)
+        buf.seek(0)
+        self._is_tty = is_tty
+
+    def isatty(self):
+        return self._is_tty
+
+
+@pytest.fixture(autouse=True, scope="module")
+def stdin():
+    """Install a SharedStdin as sys.stdin for the module; tests call .set()."""
+    shared, saved = SharedStdin(), sys.stdin
+    sys.stdin = shared
+    yield shared
+    sys.stdin = saved
+
+
+class StubMethod:
+    """Callable that records calls in a plain list and returns return_value.
+
+    A light stand-in for MagicMock: exposes the call_args and assert_* helpers
+    the tests use, without unittest.mock's per-call bookkeeping.
+    """
+
+    def __init__(self, return_value=None):
+        self.return_value = self._default = return_value
+        self.calls = []
+
+    def reset(self):
+        """Forget recorded calls and restore the canned return value."""
+        self.return_value = self._default
+        self.calls.clear()
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return self.return_value
+
+    @property
+    def call_args(self):
+        return self.calls[-1] if self.calls else None
+
+    def assert_called_once(self):
+        assert len(self.calls) == 1, f"expected 1 call, got {len(self.calls)}"
+
+    def assert_called_once_with(self, *args, **kwargs):
+        assert self.calls == [(args, kwargs)], self.calls
+
+    def assert_not_called(self):
+        assert not self.calls, self.calls
+
+
+class StubClient:
+    """PriorClient stand-in with canned responses for every method the CLI calls."""
+
+    def __init__(self):
+        self.me = StubMethod({"ok": True, "data": {
+            "agentId": "ag_test", "agentName": "test-agent", "credits": 42,
+            "tier": "free", "contributions": 5, "totalEarned": 100, "totalSpent": 58,
+        }})
+        self.search = StubMethod({"ok": True, "data": {"results": [], "cost": {"creditsCharged": 0}}})
+        self.search_stream = StubMethod(iter(()))
+        self.contribute = StubMethod({"ok": True, "data": {"id": "k_new123", "creditsEarned": 10}})
+        self.feedback = StubMethod({"ok": True, "data": {"creditsRefunded": 1}})
+        self.get_entry = StubMethod({"ok": True, "data": {
+            "id": "k_abc", "title": "Test", "status": "active", "qualityScore": 0.8,
+            "tags": ["python"], "content": "Some content",
+        }})
+        self.retract = StubMethod(None)
+
+    def reset(self):
+        for method in vars(self).values():
+            method.reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
 
 
 def mock_client(**overrides):
-    """Build a MagicMock PriorClient with sensible defaults."""
-    c = MagicMock()
-    c.me.return_value = {"ok": True, "data": {
-        "agentId": "ag_test", "agentName": "test-agent", "credits": 42,
-        "tier": "free", "contributions": 5, "totalEarned": 100, "totalSpent": 58,
-    }}
-    c.search.return_value = {"ok": True, "data": {"results": [], "cost": {"creditsCharged": 0}}}
-    c.contribute.return_value = {"ok": True, "data": {"id": "k_new123", "creditsEarned": 10}}
-    c.feedback.return_value = {"ok": True, "data": {"creditsRefunded": 1}}
-    c.get_entry.return_value = {"ok": True, "data": {
-        "id": "k_abc", "title": "Test", "status": "active", "qualityScore": 0.8,
-        "tags": ["python"], "content": "Some content",
-    }}
-    c.retract.return_value = None
+    """Build a StubClient, overriding the return value of any method by name."""
+    c = StubClient()
     for k, v in overrides.items():
         getattr(c, k).return_value = v
     return c
 
 
+@pytest.fixture(scope="module")
+def _module_client():
+    return StubClient()
+
+
 @pytest.fixture
-def client():
-    return mock_client()
+def client(_module_client):
+    """The module's StubClient, reset after each test instead of rebuilt."""
+    yield _module_client
+    _module_client.reset()
 
 
-def run_cli(argv, client, monkeypatch, stdin_text=None):
+def run_cli(argv, client, stdin_text=None):
     """Run main() with a mocked client and optional stdin, return capsys-like nothing."""
-    if stdin_text is not None:
-        monkeypatch.setattr("sys.stdin", make_stdin(stdin_text))
-    else:
-        monkeypatch.setattr("sys.stdin", make_stdin("", is_tty=True))
-    with patch("prior_tools.cli.PriorClient", return_value=client):
+    sys.stdin.set(stdin_text or "", is_tty=stdin_text is None)
+    # main() imports PriorClient from prior_tools.client at call time, so a
+    # plain attribute swap is enough; no need for patch()'s machinery.
+    saved = client_module.PriorClient
+    client_module.PriorClient = lambda **kwargs: client
+    try:
         main(argv)
+    finally:
+        client_module.PriorClient = saved
+
+
+@lru_cache(maxsize=None)
+def parsed_defaults(command):
+    """Argument defaults for `prior <command>` with no flags, parsed once."""
+    return vars(_build_parser(full=(command,)).parse_args([command]))
+
+
+def run_cmd(command, client, stdin_text=None, **overrides):
+    """Call a command's handler directly, skipping main() and argparse."""
+    sys.stdin.set(stdin_text or "", is_tty=stdin_text is None)
+    _HANDLERS[command](client, argparse.Namespace(**{**parsed_defaults(command), **overrides}))
 
 
 # ─── _read_stdin_json ───────────────────────────────────────
 
 class TestReadStdinJson:
-    def test_returns_none_when_tty(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin("", is_tty=True))
+    def test_returns_none_when_tty(self, stdin):
+        stdin.set("", is_tty=True)
         assert _read_stdin_json() is None
 
-    def test_parses_valid_json(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin('{"a": 1}'))
+    def test_parses_valid_json(self, stdin):
+        stdin.set('{"a": 1}')
         assert _read_stdin_json() == {"a": 1}
 
-    def test_returns_none_on_empty(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin(""))
+    def test_returns_none_on_empty(self, stdin):
+        stdin.set("")
         assert _read_stdin_json() is None
 
-    def test_returns_none_on_whitespace(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin("   \n  "))
+    def test_returns_none_on_whitespace(self, stdin):
+        stdin.set("   \n  ")
         assert _read_stdin_json() is None
 
-    def test_exits_on_invalid_json(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin("{bad"))
+    def test_reads_binary_buffer(self, stdin):
+        stdin.set('{"title": "caf\u00e9"}\n'.encode("utf-8"))
+        assert _read_stdin_json() == {"title": "caf\u00e9"}
+
+    def test_decodes_non_utf8_stdin_encoding(self, monkeypatch):
+        raw = '{"title": "caf\u00e9"}'.encode("cp1252")
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(raw), encoding="cp1252"))
+        assert _read_stdin_json() == {"title": "caf\u00e9"}
+
+    def test_reads_text_stream_without_buffer(self, monkeypatch):
+        monkeypatch.setattr("sys.stdin", io.StringIO('{"a": 1}'))
+        assert _read_stdin_json() == {"a": 1}
+
+    def test_exits_on_invalid_utf8(self, stdin):
+        stdin.set(b'{"a": "\xff"}')
         with pytest.raises(SystemExit):
             _read_stdin_json()
 
-    def test_exits_on_array(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin("[1,2]"))
+    def test_exits_on_invalid_json(self, stdin):
+        stdin.set("{bad")
         with pytest.raises(SystemExit):
             _read_stdin_json()
 
-    def test_exits_on_scalar(self, monkeypatch):
-        monkeypatch.setattr("sys.stdin", make_stdin('"hello"'))
+    def test_exits_on_array(self, stdin):
+        stdin.set("[1,2]")
+        with pytest.raises(SystemExit):
+            _read_stdin_json()
+
+    def test_exits_on_scalar(self, stdin):
+        stdin.set('"hello"')
         with pytest.raises(SystemExit):
             _read_stdin_json()
 
@@ -92,74 +216,114 @@ class TestReadStdinJson:
 # ─── cmd_status ─────────────────────────────────────────────
 
 class TestStatus:
-    def test_human_output(self, client, monkeypatch, capsys):
-        run_cli(["status"], client, monkeypatch)
+    def test_human_output(self, client, capsys):
+        run_cli(["status"], client)
         out = capsys.readouterr().out
         assert "ag_test" in out
         assert "42" in out
         assert "free" in out
 
-    def test_json_output(self, client, monkeypatch, capsys):
-        run_cli(["--json", "status"], client, monkeypatch)
+    def test_json_output(self, client, capsys):
+        run_cli(["--json", "status"], client)
         data = json.loads(capsys.readouterr().out)
         assert data["agentId"] == "ag_test"
 
-    def test_error_response(self, monkeypatch):
+    def test_error_response(self):
         c = mock_client(me={"ok": False, "error": "unauthorized"})
         with pytest.raises(SystemExit):
-            run_cli(["status"], c, monkeypatch)
+            run_cli(["status"], c)
 
 
 # ─── cmd_search ─────────────────────────────────────────────
 
+# Built once at import; tests wrap it in their own response dict because
+# cmd_search adds _meta to the data it is given.
+_LARGE_RESULTS = [
+    {"title": f"T{i}", "id": f"k_{i}", "relevanceScore": 0.8, "trustLevel": "high",
+     "tags": [], "problem": "", "solution": ""}
+    for i in range(1000)
+]
+
+
 class TestSearch:
-    def test_multi_word_query_joined(self, client, monkeypatch):
-        run_cli(["search", "foo", "bar", "baz"], client, monkeypatch)
+    def test_multi_word_query_joined(self, client):
+        run_cli(["search", "foo", "bar", "baz"], client)
         client.search.assert_called_once()
         assert client.search.call_args[1]["max_results"] == 3
         # first positional is query
         assert client.search.call_args[0][0] == "foo bar baz"
 
-    def test_max_results_alias(self, client, monkeypatch):
-        run_cli(["search", "q", "-n", "7"], client, monkeypatch)
+    def test_single_word_query_passed_through(self, client):
+        run_cli(["search", "ECONNREFUSED"], client)
+        assert client.search.call_args[0][0] == "ECONNREFUSED"
+
+    def test_max_results_alias(self, client):
+        run_cli(["search", "q", "-n", "7"], client)
         assert client.search.call_args[1]["max_results"] == 7
 
-    def test_no_results_message(self, client, monkeypatch, capsys):
-        run_cli(["search", "nothing"], client, monkeypatch)
+    def test_no_results_message(self, client, capsys):
+        run_cli(["search", "nothing"], client)
         assert "No results found" in capsys.readouterr().out
 
-    def test_results_display(self, monkeypatch, capsys):
+    def test_results_display(self, capsys):
         c = mock_client(search={"ok": True, "data": {
             "results": [{"title": "Fix X", "id": "k_1", "relevanceScore": 0.85,
                           "trustLevel": "high", "tags": ["py"], "problem": "err",
                           "solution": "do Y"}],
             "cost": {"creditsCharged": 1, "balanceRemaining": 41},
         }})
-        run_cli(["search", "err"], c, monkeypatch)
+        run_cli(["search", "err"], c)
         out = capsys.readouterr().out
         assert "Fix X" in out
         assert "0.850" in out
 
-    def test_json_flag(self, client, monkeypatch, capsys):
-        run_cli(["--json", "search", "q"], client, monkeypatch)
+    def test_renders_many_results(self, capsys):
+        c = mock_client(search={"ok": True, "data": {
+            "results": _LARGE_RESULTS, "cost": {"creditsCharged": 1, "balanceRemaining": 41},
+        }})
+        run_cli(["search", "err", "-n", "1000"], c)
+        out = capsys.readouterr().out
+        assert out.count("    ID: k_") == len(_LARGE_RESULTS)
+        assert "[1000] T999" in out
+        assert "prior feedback k_0 useful" in out
+
+    def test_stream_flag_renders_incrementally(self, client, capsys):
+        client.search_stream.return_value = iter([
+            {"title": "Fix X", "id": "k_1", "relevanceScore": 0.85, "tags": ["py"]},
+            {"title": "Fix Y", "id": "k_2", "relevanceScore": 0.5, "tags": []},
+        ])
+        run_cli(["search", "err", "--stream"], client)
+        out = capsys.readouterr().out
+        client.search.assert_not_called()
+        assert "[1] Fix X" in out
+        assert "[2] Fix Y" in out
+        assert "prior feedback k_1 useful" in out
+
+    def test_stream_ignored_with_json(self, client, capsys):
+        run_cli(["--json", "search", "q", "--stream"], client)
+        client.search_stream.assert_not_called()
+        assert "results" in json.loads(capsys.readouterr().out)
+
+    def test_json_flag(self, client, capsys):
+        run_cli(["--json", "search", "q"], client)
         data = json.loads(capsys.readouterr().out)
         assert "results" in data
 
-    def test_empty_query_errors(self, monkeypatch):
+    def test_empty_query_errors(self):
         # argparse requires at least one query word (nargs="+")
         with pytest.raises(SystemExit):
-            run_cli(["search"], mock_client(), monkeypatch)
+            run_cli(["search"], mock_client())
 
-    def test_context_flags(self, client, monkeypatch):
+    def test_context_flags(self, client):
         run_cli(["search", "q", "--context-os", "linux", "--context-shell", "bash",
-                 "--context-tools", "docker", "git"], client, monkeypatch)
+                 "--context-tools", "docker", "git"], client)
         ctx = client.search.call_args[1]["context"]
         assert ctx["os"] == "linux"
         assert ctx["shell"] == "bash"
         assert ctx["tools"] == ["docker", "git"]
 
-    def test_min_quality_and_max_tokens(self, client, monkeypatch):
-        run_cli(["search", "q", "--min-quality", "0.5", "--max-tokens", "1000"], client, monkeypatch)
+    def test_min_quality_and_max_tokens(self, client):
+        run_cli(["search", "q", "--min-quality", "0.5", "--max-tokens", "1000"], client)
         assert client.search.call_args[1]["min_quality"] == 0.5
         assert client.search.call_args[1]["max_tokens"] == 1000
 
@@ -168,9 +332,20 @@ class TestSearch:
 
 class TestContribute:
     BASIC_JSON = json.dumps({"title": "T", "content": "C", "tags": ["py"]})
-
-    def test_stdin_provides_all(self, client, monkeypatch, capsys):
-        run_cli(["contribute"], client, monkeypatch, stdin_text=self.BASIC_JSON)
+    OLD_JSON = json.dumps({"title": "old", "content": "old", "tags": ["old"]})
+    NO_TITLE_JSON = json.dumps({"content": "C", "tags": ["a"]})
+    NO_CONTENT_JSON = json.dumps({"title": "T", "tags": ["a"]})
+    NO_TAGS_JSON = json.dumps({"title": "T", "content": "C"})
+    THREE_TAGS_JSON = json.dumps({"title": "T", "content": "C", "tags": ["a", "b", "c"]})
+    ENV = {"language": "python", "os": "linux"}
+    EXTRAS_JSON = json.dumps({
+        "title": "T", "content": "C", "tags": ["a"], "model": "gpt-4", "environment": ENV,
+        "effort": {"tokensUsed": 5000, "durationSeconds": 300},
+        "errorMessages": ["err1", "err2"], "failedApproaches": ["tried X"],
+    })
+
+    def test_stdin_provides_all(self, client, capsys):
+        run_cli(["contribute"], client, stdin_text=self.BASIC_JSON)
         out = capsys.readouterr().out
         assert "k_new123" in out
         assert "10" in out
@@ -179,145 +354,142 @@ class TestContribute:
         assert kw[1]["title"] == "T"
         assert kw[1]["tags"] == ["py"]
 
-    def test_cli_flags_override_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"title": "old", "content": "old", "tags": ["old"]})
+    def test_cli_flags_override_stdin(self, client):
         run_cli(["contribute", "--title", "new", "--content", "new", "--tags", "new"],
-                client, monkeypatch, stdin_text=stdin)
+                client, stdin_text=self.OLD_JSON)
         kw = client.contribute.call_args[1]
         assert kw["title"] == "new"
         assert kw["content"] == "new"
         assert kw["tags"] == ["new"]
 
-    def test_partial_merge(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "tags": ["a"]})
-        run_cli(["contribute", "--content", "C"], client, monkeypatch, stdin_text=stdin)
+    def test_partial_merge(self, client):
+        run_cli(["contribute", "--content", "C"], client, stdin_text=self.NO_CONTENT_JSON)
         kw = client.contribute.call_args[1]
         assert kw["title"] == "T"
         assert kw["content"] == "C"
         assert kw["tags"] == ["a"]
 
-    def test_missing_title_errors(self, client, monkeypatch):
-        stdin = json.dumps({"content": "C", "tags": ["a"]})
-        with pytest.raises(SystemExit):
-            run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
-
-    def test_missing_content_errors(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "tags": ["a"]})
+    @pytest.mark.parametrize("stdin_text,message", [
+        (NO_TITLE_JSON, "title is required"),
+        (NO_CONTENT_JSON, "content is required"),
+        (NO_TAGS_JSON, "tags are required"),
+    ], ids=["title", "content", "tags"])
+    def test_missing_field_errors(self, client, capsys, stdin_text, message):
         with pytest.raises(SystemExit):
-            run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+            run_cmd("contribute", client, stdin_text=stdin_text)
+        assert message in capsys.readouterr().err
+        client.contribute.assert_not_called()
 
-    def test_missing_tags_errors(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C"})
-        with pytest.raises(SystemExit):
-            run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+    def test_tags_flag_strips_and_drops_empty(self, client):
+        run_cli(["contribute", "--title", "T", "--content", "C", "--tags", " a, ,b ,"],
+                client)
+        assert client.contribute.call_args[1]["tags"] == ["a", "b"]
 
-    def test_tags_from_stdin_array(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a", "b", "c"]})
-        run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+    def test_tags_from_stdin_array(self, client):
+        run_cmd("contribute", client, stdin_text=self.THREE_TAGS_JSON)
         assert client.contribute.call_args[1]["tags"] == ["a", "b", "c"]
 
-    def test_effort_from_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a"],
-                            "effort": {"tokensUsed": 5000, "durationSeconds": 300}})
-        run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+    def test_effort_from_stdin(self, client):
+        run_cmd("contribute", client, stdin_text=self.EXTRAS_JSON)
         assert client.contribute.call_args[1]["effort"] == {"tokensUsed": 5000, "durationSeconds": 300}
 
-    def test_effort_cli_overrides_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a"],
-                            "effort": {"tokensUsed": 100}})
-        run_cli(["contribute", "--effort-tokens", "999"], client, monkeypatch, stdin_text=stdin)
+    def test_effort_cli_overrides_stdin(self, client):
+        run_cli(["contribute", "--effort-tokens", "999"], client, stdin_text=self.EXTRAS_JSON)
         assert client.contribute.call_args[1]["effort"]["tokensUsed"] == 999
 
-    def test_environment_from_stdin_object(self, client, monkeypatch):
-        env = {"language": "python", "os": "linux"}
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a"], "environment": env})
-        run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
-        assert client.contribute.call_args[1]["environment"] == env
+    def test_environment_from_stdin_object(self, client):
+        run_cmd("contribute", client, stdin_text=self.EXTRAS_JSON)
+        assert client.contribute.call_args[1]["environment"] == self.ENV
 
-    def test_environment_cli_json_string(self, client, monkeypatch):
+    def test_environment_cli_json_string(self, client):
         env = {"language": "go"}
         run_cli(["contribute", "--title", "T", "--content", "C", "--tags", "a",
-                 "--environment", json.dumps(env)], client, monkeypatch)
+                 "--environment", json.dumps(env)], client)
         assert client.contribute.call_args[1]["environment"] == env
 
-    def test_error_messages_from_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a"],
-                            "errorMessages": ["err1", "err2"]})
-        run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+    def test_environment_must_be_object(self, client, capsys):
+        with pytest.raises(SystemExit):
+            run_cli(["contribute", "--title", "T", "--content", "C", "--tags", "a",
+                     "--environment", "linux"], client)
+        assert "--environment must be a JSON object" in capsys.readouterr().err
+        client.contribute.assert_not_called()
+
+    def test_error_messages_from_stdin(self, client):
+        run_cmd("contribute", client, stdin_text=self.EXTRAS_JSON)
         assert client.contribute.call_args[1]["error_messages"] == ["err1", "err2"]
 
-    def test_failed_approaches_from_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a"],
-                            "failedApproaches": ["tried X"]})
-        run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+    def test_failed_approaches_from_stdin(self, client):
+        run_cmd("contribute", client, stdin_text=self.EXTRAS_JSON)
         assert client.contribute.call_args[1]["failed_approaches"] == ["tried X"]
 
-    def test_json_output(self, client, monkeypatch, capsys):
-        run_cli(["--json", "contribute"], client, monkeypatch, stdin_text=self.BASIC_JSON)
+    def test_json_output(self, client, capsys):
+        run_cli(["--json", "contribute"], client, stdin_text=self.BASIC_JSON)
         data = json.loads(capsys.readouterr().out)
         assert data["id"] == "k_new123"
 
-    def test_model_default_unknown(self, client, monkeypatch):
-        run_cli(["contribute"], client, monkeypatch, stdin_text=self.BASIC_JSON)
+    def test_model_default_unknown(self, client):
+        run_cmd("contribute", client, stdin_text=self.BASIC_JSON)
         assert client.contribute.call_args[1]["model"] == "unknown"
 
-    def test_model_from_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"title": "T", "content": "C", "tags": ["a"], "model": "gpt-4"})
-        run_cli(["contribute"], client, monkeypatch, stdin_text=stdin)
+    def test_model_from_stdin(self, client):
+        run_cmd("contribute", client, stdin_text=self.EXTRAS_JSON)
         assert client.contribute.call_args[1]["model"] == "gpt-4"
 
 
 # ─── cmd_feedback ───────────────────────────────────────────
 
 class TestFeedback:
-    def test_positional_args(self, client, monkeypatch, capsys):
-        run_cli(["feedback", "k_abc", "useful"], client, monkeypatch)
+    FULL_JSON = json.dumps({"entryId": "k_xyz", "outcome": "not_useful", "reason": "old"})
+    OLD_JSON = json.dumps({"entryId": "k_old", "outcome": "useful"})
+    CORRECTION_JSON = json.dumps({"entryId": "k_1", "outcome": "not_useful",
+                                  "correction": {"content": "x" * 100, "title": "Fixed"}})
+    NO_ENTRY_JSON = json.dumps({"outcome": "useful"})
+    NO_OUTCOME_JSON = json.dumps({"entryId": "k_1"})
+
+    def test_positional_args(self, client, capsys):
+        run_cli(["feedback", "k_abc", "useful"], client)
         out = capsys.readouterr().out
         assert "Refund: 1" in out
         client.feedback.assert_called_once()
         assert client.feedback.call_args[1]["entry_id"] == "k_abc"
         assert client.feedback.call_args[1]["outcome"] == "useful"
 
-    def test_stdin_provides_fields(self, client, monkeypatch):
-        stdin = json.dumps({"entryId": "k_xyz", "outcome": "not_useful", "reason": "old"})
-        run_cli(["feedback"], client, monkeypatch, stdin_text=stdin)
+    def test_stdin_provides_fields(self, client):
+        run_cli(["feedback"], client, stdin_text=self.FULL_JSON)
         kw = client.feedback.call_args[1]
         assert kw["entry_id"] == "k_xyz"
         assert kw["outcome"] == "not_useful"
         assert kw["reason"] == "old"
 
-    def test_cli_overrides_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"entryId": "k_old", "outcome": "useful"})
-        run_cli(["feedback", "k_new", "not_useful"], client, monkeypatch, stdin_text=stdin)
+    def test_cli_overrides_stdin(self, client):
+        run_cli(["feedback", "k_new", "not_useful"], client, stdin_text=self.OLD_JSON)
         kw = client.feedback.call_args[1]
         assert kw["entry_id"] == "k_new"
         assert kw["outcome"] == "not_useful"
 
-    def test_correction_from_stdin(self, client, monkeypatch):
-        stdin = json.dumps({"entryId": "k_1", "outcome": "not_useful",
-                            "correction": {"content": "x" * 100, "title": "Fixed"}})
-        run_cli(["feedback"], client, monkeypatch, stdin_text=stdin)
+    def test_correction_from_stdin(self, client):
+        run_cmd("feedback", client, stdin_text=self.CORRECTION_JSON)
         corr = client.feedback.call_args[1]["correction"]
         assert corr["title"] == "Fixed"
         assert len(corr["content"]) == 100
 
-    def test_missing_entry_id_errors(self, client, monkeypatch):
-        stdin = json.dumps({"outcome": "useful"})
+    @pytest.mark.parametrize("stdin_text,message", [
+        (NO_ENTRY_JSON, "entry ID is required"),
+        (NO_OUTCOME_JSON, "outcome is required"),
+    ], ids=["entry_id", "outcome"])
+    def test_missing_field_errors(self, client, capsys, stdin_text, message):
         with pytest.raises(SystemExit):
-            run_cli(["feedback"], client, monkeypatch, stdin_text=stdin)
+            run_cmd("feedback", client, stdin_text=stdin_text)
+        assert message in capsys.readouterr().err
+        client.feedback.assert_not_called()
 
-    def test_missing_outcome_errors(self, client, monkeypatch):
-        stdin = json.dumps({"entryId": "k_1"})
-        with pytest.raises(SystemExit):
-            run_cli(["feedback"], client, monkeypatch, stdin_text=stdin)
-
-    def test_invalid_outcome_errors(self, monkeypatch):
+    def test_invalid_outcome_errors(self):
         # argparse choices will reject "bad" as positional
         with pytest.raises(SystemExit):
-            run_cli(["feedback", "k_1", "bad"], mock_client(), monkeypatch)
+            run_cli(["feedback", "k_1", "bad"], mock_client())
 
-    def test_json_output(self, client, monkeypatch, capsys):
-        run_cli(["--json", "feedback", "k_1", "useful"], client, monkeypatch)
+    def test_json_output(self, client, capsys):
+        run_cli(["--json", "feedback", "k_1", "useful"], client)
         data = json.loads(capsys.readouterr().out)
         assert data["creditsRefunded"] == 1
 
@@ -325,68 +497,134 @@ class TestFeedback:
 # ─── cmd_get ────────────────────────────────────────────────
 
 class TestGet:
-    def test_human_output(self, client, monkeypatch, capsys):
-        run_cli(["get", "k_abc"], client, monkeypatch)
+    def test_human_output(self, client, capsys):
+        run_cli(["get", "k_abc"], client)
         out = capsys.readouterr().out
         assert "Test" in out
         assert "Some content" in out
 
-    def test_json_output(self, client, monkeypatch, capsys):
-        run_cli(["--json", "get", "k_abc"], client, monkeypatch)
+    def test_json_output(self, client, capsys):
+        run_cli(["--json", "get", "k_abc"], client)
         data = json.loads(capsys.readouterr().out)
         assert data["id"] == "k_abc"
 
-    def test_missing_id_errors(self, client, monkeypatch):
+    def test_missing_id_errors(self, client):
         with pytest.raises(SystemExit):
-            run_cli(["get"], client, monkeypatch)
+            run_cli(["get"], client)
 
 
 # ─── cmd_retract ────────────────────────────────────────────
 
 class TestRetract:
-    def test_retract_output(self, client, monkeypatch, capsys):
-        run_cli(["retract", "k_abc"], client, monkeypatch)
+    def test_retract_output(self, client, capsys):
+        run_cli(["retract", "k_abc"], client)
         assert "Retracted: k_abc" in capsys.readouterr().out
         client.retract.assert_called_once_with("k_abc")
 
 
 # ─── Help text ──────────────────────────────────────────────
 
+_HELP_KEYWORDS = {
+    (): ["status", "search", "contribute", "feedback"],
+    ("status",): ["agent", "credit"],
+    ("search",): ["query", "max-results"],
+    ("contribute",): ["title", "content", "tags", "stdin"],
+    ("feedback",): ["outcome", "useful"],
+    ("get",): ["entry"],
+    ("retract",): ["retract"],
+}
+
+
+@lru_cache(maxsize=None)
+def help_text(cmd):
+    """Render `prior <cmd> --help` once per command; returns it lowercased."""
+    out = io.StringIO()
+    with pytest.raises(SystemExit) as exc_info, redirect_stdout(out):
+        main([*cmd, "--help"])
+    assert exc_info.value.code == 0
+    return out.getvalue().lower()
+
+
 class TestHelp:
-    @pytest.mark.parametrize("cmd,keywords", [
-        (["--help"], ["status", "search", "contribute", "feedback"]),
-        (["status", "--help"], ["agent", "credit"]),
-        (["search", "--help"], ["query", "max-results"]),
-        (["contribute", "--help"], ["title", "content", "tags", "stdin"]),
-        (["feedback", "--help"], ["outcome", "useful"]),
-        (["get", "--help"], ["entry"]),
-        (["retract", "--help"], ["retract"]),
+    @pytest.mark.parametrize("cmd,keyword", [
+        (cmd, kw) for cmd, keywords in _HELP_KEYWORDS.items() for kw in keywords
     ])
-    def test_help_contains_keywords(self, cmd, keywords, monkeypatch, capsys):
+    def test_help_contains_keyword(self, cmd, keyword):
+        assert keyword in help_text(cmd), f"'{keyword}' not found in help for {cmd}"
+
+    def test_parser_is_built_once(self):
+        assert _build_parser() is _build_parser()
+
+    def test_version(self, capsys):
         with pytest.raises(SystemExit) as exc_info:
-            with patch("prior_tools.cli.PriorClient"):
-                main(cmd)
+            main(["--version"])
         assert exc_info.value.code == 0
-        out = capsys.readouterr().out.lower()
-        for kw in keywords:
-            assert kw in out, f"'{kw}' not found in help for {cmd}"
+        assert capsys.readouterr().out.startswith("prior ")
+
+    def test_top_level_parser_skips_subcommand_arguments(self):
+        help_text = _build_parser(full=()).format_help()
+        assert "search" in help_text
+        with pytest.raises(SystemExit):
+            _build_parser(full=()).parse_args(["search", "q", "-n", "5"])
+
+    def test_single_subcommand_parser(self):
+        parser = _build_parser(full=("search",))
+        args = parser.parse_args(["search", "q", "-n", "5"])
+        assert args.max_results == 5
+        with pytest.raises(SystemExit):
+            parser.parse_args(["get", "k_1"])
+
+    @pytest.mark.parametrize("argv", [
+        ["status"],
+        ["--json", "status"],
+        ["get", "k_1"],
+        ["--api-key", "ask_x", "--base-url=https://h", "retract", "k_1"],
+    ])
+    def test_fast_parse_matches_argparse(self, argv):
+        assert _fast_parse(argv) == _build_parser().parse_args(argv)
+
+    @pytest.mark.parametrize("argv", [
+        [],
+        ["--json"],
+        ["status", "--help"],
+        ["get"],
+        ["get", "k_1", "k_2"],
+        ["get", "-x"],
+        ["--api", "ask_x", "status"],
+        ["--api-key", "--json", "status"],
+        ["search", "q"],
+    ])
+    def test_fast_parse_defers_to_argparse(self, argv):
+        assert _fast_parse(argv) is None
+
+    @pytest.mark.parametrize("argv,command", [
+        ([], None),
+        (["--help"], None),
+        (["search", "q"], "search"),
+        (["--json", "get", "k_1"], "get"),
+        (["--api-key", "status", "search", "q"], "search"),
+        (["--api", "k", "status"], "status"),
+        (["--base-url=https://x", "feedback"], "feedback"),
+        (["--", "retract"], "retract"),
+    ])
+    def test_sniff_command(self, argv, command):
+        assert _sniff_command(argv) == command
 
 
 # ─── No command → help ──────────────────────────────────────
 
 class TestNoCommand:
-    def test_no_command_exits_zero(self, monkeypatch, capsys):
+    def test_no_command_exits_zero(self):
         with pytest.raises(SystemExit) as exc_info:
-            with patch("prior_tools.cli.PriorClient"):
-                main([])
+            main([])
         assert exc_info.value.code == 0
 
 
 # ─── Client init failure ───────────────────────────────────
 
 class TestClientInitFailure:
-    def test_client_init_error(self, monkeypatch):
-        with patch("prior_tools.cli.PriorClient", side_effect=RuntimeError("no config")):
+    def test_client_init_error(self):
+        with patch("prior_tools.client.PriorClient", side_effect=RuntimeError("no config")):
             with pytest.raises(SystemExit):
                 main(["status"])
 
@@ -448,7 +686,7 @@ class TestExpandNudgeTokens:
 # ─── Nudge previousResults passthrough tests ─────────────
 
 class TestNudgePreviousResults:
-    def test_previousResults_in_meta(self, monkeypatch, capsys):
+    def test_previousResults_in_meta(self, capsys):
         nudge = {
             "kind": "feedback_reminder",
             "message": "Your search returned 2 results.",
@@ -469,7 +707,7 @@ class TestNudgePreviousResults:
             "cost": {"creditsCharged": 1, "balanceRemaining": 41},
             "nudge": nudge,
         }})
-        run_cli(["--json", "search", "CORS error"], c, monkeypatch)
+        run_cli(["--json", "search", "CORS error"], c)
         data = json.loads(capsys.readouterr().out)
         meta_nudge = data.get("_meta", {}).get("nudge", {})
         assert "previousResults" in meta_nudge
@@ -479,7 +717,7 @@ class TestNudgePreviousResults:
         assert meta_nudge["previousResults"][0]["feedbackCommand"] == "prior feedback k_abc useful"
         assert meta_nudge["previousResults"][1]["feedbackCommand"] == "prior feedback k_def useful"
 
-    def test_no_previousResults_when_absent(self, monkeypatch, capsys):
+    def test_no_previousResults_when_absent(self, capsys):
         nudge = {
             "kind": "contribute_reminder",
             "message": "No results for your query.",
@@ -496,12 +734,12 @@ class TestNudgePreviousResults:
             "cost": {"creditsCharged": 1, "balanceRemaining": 40},
             "nudge": nudge,
         }})
-        run_cli(["--json", "search", "zig segfault"], c, monkeypatch)
+        run_cli(["--json", "search", "zig segfault"], c)
         data = json.loads(capsys.readouterr().out)
         meta_nudge = data.get("_meta", {}).get("nudge", {})
         assert "previousResults" not in meta_nudge
 
-    def test_previousResults_displayed_to_stderr(self, monkeypatch, capsys):
+    def test_previousResults_displayed_to_stderr(self, capsys):
         nudge = {
             "kind": "feedback_reminder",
             "message": "Your search returned results.",
@@ -521,7 +759,7 @@ class TestNudgePreviousResults:
             "cost": {"creditsCharged": 1, "balanceRemaining": 39},
             "nudge": nudge,
         }})
-        run_cli(["search", "test query"], c, monkeypatch)
+        run_cli(["search", "test query"], c)
         out = capsys.readouterr()
         assert "Results from that search:" in out.out
         assert "prior feedback k_test useful" in out.out
@@ -1,14 +1,47 @@
 """Tests for PriorClient with mocked HTTP."""
 
+import asyncio
 import json
+import subprocess
+import sys
 from unittest.mock import patch, MagicMock
 
 import pytest
 
+from prior_tools.async_client import AsyncPriorClient
 from prior_tools.client import PriorClient
 
 
+def mock_response(payload):
+    """Build a fake requests.Response whose body and .json() agree."""
+    resp = MagicMock()
+    resp.status_code = 200
+    resp.headers = {}
+    resp.content = json.dumps(payload).encode()
+    resp.json.return_value = payload
+    return resp
+
+
+def sent_body(mock_req):
+    """Decode the JSON body of the last request made through mock_req."""
+    return json.loads(mock_req.call_args[1]["data"])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _session_request():
+    """Patch requests.Session.request once for the whole module."""
+    with patch("requests.Session.request") as mock_req:
+        yield mock_req
+
+
 @pytest.fixture
+def http(_session_request):
+    """The module-wide request mock, reset; set return_value/side_effect on it."""
+    _session_request.reset_mock(return_value=True, side_effect=True)
+    return _session_request
+
+
+@pytest.fixture(scope="session")
 def mock_config():
     return {
         "base_url": "https://test.example.com",
@@ -17,77 +50,645 @@ def mock_config():
     }
 
 
-@pytest.fixture
-def client(mock_config):
-    with patch("prior_tools.client.load_config", return_value=mock_config):
+def _make_client(config):
+    with patch("prior_tools.config.load_config", return_value=config):
         return PriorClient()
 
 
+@pytest.fixture(scope="session")
+def client(mock_config):
+    """Client shared by every test that only calls methods with HTTP patched."""
+    return _make_client(mock_config)
+
+
+@pytest.fixture
+def fresh_client(mock_config):
+    """Per-test client for tests that change its token, cache or session."""
+    return _make_client(mock_config)
+
+
 class TestSearch:
-    def test_search_basic(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": [{"id": "k_1", "title": "Test"}]}
-        mock_resp.content = b'{"results": []}'
-
-        with patch("requests.request", return_value=mock_resp) as mock_req:
-            result = client.search("test query", context={"runtime": "python"})
-            mock_req.assert_called_once()
-            call_kwargs = mock_req.call_args
-            assert "/v1/knowledge/search" in call_kwargs[0][1]
-            body = call_kwargs[1]["json"]
-            assert body["context"] == {"runtime": "python"}
-
-    def test_search_with_context(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.content = b'{"results": []}'
-
-        with patch("requests.request", return_value=mock_resp) as mock_req:
-            client.search("test", context={"runtime": "openclaw", "os": "windows"})
-            body = mock_req.call_args[1]["json"]
-            assert body["context"] == {"runtime": "openclaw", "os": "windows"}
+    @pytest.mark.parametrize("context", [
+        {"runtime": "python"},
+        {"runtime": "openclaw", "os": "windows"},
+    ])
+    def test_search_basic(self, client, context, http):
+        mock_resp = mock_response({"results": [{"id": "k_1", "title": "Test"}]})
+
+        http.return_value = mock_resp
+        result = client.search("test query", context=context)
+        http.assert_called_once()
+        call_kwargs = http.call_args
+        assert "/v1/knowledge/search" in call_kwargs[0][1]
+        body = sent_body(http)
+        assert body["context"] == context
+
+    def test_body_sent_as_compact_utf8(self, client, http):
+        http.return_value = mock_response({})
+        client.search("caf\u00e9 crash", context={"runtime": "python"})
+        data = http.call_args[1]["data"]
+        assert isinstance(data, bytes)
+        assert "json" not in http.call_args[1]
+        assert "caf\u00e9".encode("utf-8") in data
+        assert b'": ' not in data
+
+
+class TestSearchStream:
+    PAYLOAD = {"ok": True, "data": {"results": [
+        {"id": "k_1", "score": 0.5, "tags": ["a", "b"], "environment": {"os": ["linux"]}},
+        {"id": "k_2", "score": 0.25, "tags": []},
+    ]}}
+
+    @staticmethod
+    def streamed(payload):
+        """A streaming response that delivers payload's JSON in 16-byte chunks."""
+        body = json.dumps(payload).encode()
+        resp = MagicMock()
+        resp.__enter__.return_value = resp
+        resp.iter_content.return_value = [body[i:i + 16] for i in range(0, len(body), 16)]
+        return resp
+
+    def test_falls_back_to_search_without_ijson(self, client, http):
+        with patch.dict(sys.modules, {"ijson": None}):
+            http.return_value = mock_response(self.PAYLOAD)
+            assert [r["id"] for r in client.search_stream("q")] == ["k_1", "k_2"]
+
+    def test_streams_with_ijson(self, client, http):
+        pytest.importorskip("ijson")
+        http.return_value = self.streamed(self.PAYLOAD)
+        results = list(client.search_stream("q"))
+        assert results == self.PAYLOAD["data"]["results"]
+        assert [type(r["score"]) for r in results] == [float, float]
+        assert http.call_args[1]["stream"] is True
+
+    def test_api_error_raises(self, client, http):
+        with patch.dict(sys.modules, {"ijson": None}):
+            http.return_value = mock_response({"ok": False, "error": "bad"})
+            with pytest.raises(RuntimeError, match="bad"):
+                list(client.search_stream("q"))
+
+    def test_api_error_raises_with_ijson(self, client, http):
+        pytest.importorskip("ijson")
+        http.return_value = self.streamed({"ok": False, "error": "bad"})
+        with pytest.raises(RuntimeError, match="bad"):
+            list(client.search_stream("q"))
 
 
 class TestContribute:
-    def test_contribute(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"id": "k_new", "status": "active"}
-        mock_resp.content = b'{}'
+    def test_contribute(self, client, http):
+        mock_resp = mock_response({"id": "k_new", "status": "active"})
 
-        with patch("requests.request", return_value=mock_resp) as mock_req:
-            result = client.contribute("Title", "Content " * 20, tags=["test"], model="claude-opus-4")
-            body = mock_req.call_args[1]["json"]
-            assert body["title"] == "Title"
-            assert body["tags"] == ["test"]
-            assert body["model"] == "claude-opus-4"
+        http.return_value = mock_resp
+        result = client.contribute("Title", "Content " * 20, tags=["test"], model="claude-opus-4")
+        body = sent_body(http)
+        assert body["title"] == "Title"
+        assert body["tags"] == ["test"]
+        assert body["model"] == "claude-opus-4"
 
 
 class TestFeedback:
-    def test_useful_feedback(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"status": "recorded"}
-        mock_resp.content = b'{}'
+    def test_useful_feedback(self, client, http):
+        mock_resp = mock_response({"status": "recorded"})
+
+        http.return_value = mock_resp
+        client.feedback("k_1", "useful", notes="worked great")
+        body = sent_body(http)
+        assert body["outcome"] == "useful"
+
+
+class TestBatches:
+    def test_feedback_many_keeps_item_order(self, client, http):
+        def respond(method, url, **kwargs):
+            return mock_response({"url": url})
+
+        http.side_effect = respond
+        results = client.feedback_many([
+            {"entry_id": "k_1", "outcome": "useful"},
+            {"entry_id": "k_2", "outcome": "not_useful", "reason": "outdated"},
+        ])
+        assert [r["url"].split("/")[-2] for r in results] == ["k_1", "k_2"]
+
+    def test_failure_raised_after_all_calls(self, client, http):
+        def respond(method, url, **kwargs):
+            if "k_1" in url:
+                raise RuntimeError("boom")
+            return mock_response({})
+
+        http.side_effect = respond
+        with pytest.raises(RuntimeError, match="boom"):
+            client.feedback_many([{"entry_id": "k_1", "outcome": "useful"},
+                                  {"entry_id": "k_2", "outcome": "useful"}])
+        assert http.call_count == 2
+
+    def test_return_exceptions_keeps_other_results(self, client, http):
+        def respond(method, url, **kwargs):
+            if "Broken" in kwargs["data"].decode():
+                raise RuntimeError("boom")
+            return mock_response({"title": json.loads(kwargs["data"])["title"]})
+
+        http.side_effect = respond
+        results = client.contribute_many([
+            {"title": "First", "content": "C", "tags": ["a"], "model": "m"},
+            {"title": "Broken", "content": "C", "tags": ["a"], "model": "m"},
+            {"title": "Third", "content": "C", "tags": ["a"], "model": "m"},
+        ], return_exceptions=True)
+        assert results[0] == {"title": "First"}
+        assert isinstance(results[1], RuntimeError)
+        assert results[2] == {"title": "Third"}
+
+
+class TestFeedbackBatchTool:
+    @pytest.fixture
+    def stub(self):
+        stub = MagicMock(spec=PriorClient)
+        stub.feedback_many.return_value = [{"ok": True}, RuntimeError("boom")]
+        return stub
+
+    ITEMS = [
+        {"id": "k_1", "outcome": "useful"},
+        {"id": "k_2", "outcome": "not_useful", "reason": "outdated", "correction": "x" * 100},
+    ]
+
+    def test_run_with_list(self, stub):
+        from prior_tools.tools import PriorFeedbackBatchTool
+
+        assert PriorFeedbackBatchTool(client=stub).run(self.ITEMS) == [{"ok": True}, {"error": "boom"}]
+        items = stub.feedback_many.call_args[0][0]
+        assert [i["entry_id"] for i in items] == ["k_1", "k_2"]
+        assert items[1]["reason"] == "outdated"
+        assert items[1]["correction"] == {"content": "x" * 100}
+        assert stub.feedback_many.call_args[1] == {"return_exceptions": True}
+
+    def test_run_with_items_dict(self, stub):
+        from prior_tools.tools import PriorFeedbackBatchTool
+
+        PriorFeedbackBatchTool(client=stub).run({"items": self.ITEMS})
+        assert len(stub.feedback_many.call_args[0][0]) == 2
+
+    def test_run_rejects_other_input(self, stub):
+        from prior_tools.tools import PriorFeedbackBatchTool
+
+        assert "error" in PriorFeedbackBatchTool(client=stub).run("k_1 useful")
+        stub.feedback_many.assert_not_called()
+
+
+class TestDefaultClient:
+    @pytest.fixture(autouse=True)
+    def reset_default(self, mock_config):
+        from prior_tools.tools import set_default_client
+
+        set_default_client(None)
+        with patch("prior_tools.config.load_config", return_value=mock_config):
+            yield
+        set_default_client(None)
+
+    def test_tools_without_client_share_one(self):
+        from prior_tools.tools import PriorFeedbackTool, PriorSearchTool, PriorStatusTool
+
+        shared = PriorSearchTool()._client
+        assert isinstance(shared, PriorClient)
+        assert PriorFeedbackTool()._client is shared
+        assert PriorStatusTool()._client is shared
+
+    def test_set_default_client_none_resets(self):
+        from prior_tools.tools import PriorSearchTool, set_default_client
+
+        first = PriorSearchTool()._client
+        set_default_client(None)
+        assert PriorSearchTool()._client is not first
+
+    def test_set_default_client_is_used(self):
+        from prior_tools.tools import PriorGetTool, set_default_client
+
+        stub = MagicMock(spec=PriorClient)
+        set_default_client(stub)
+        assert PriorGetTool()._client is stub
+
+    def test_explicit_client_wins(self):
+        from prior_tools.tools import PriorSearchTool, set_default_client
+
+        set_default_client(MagicMock(spec=PriorClient))
+        stub = MagicMock(spec=PriorClient)
+        assert PriorSearchTool(client=stub)._client is stub
+
+
+class TestStandaloneTools:
+    @pytest.fixture
+    def stub(self):
+        return MagicMock(spec=PriorClient)
+
+    def test_search_string_input(self, stub):
+        from prior_tools.tools import PriorSearchTool
+
+        assert PriorSearchTool(client=stub).run("CORS 403") is stub.search.return_value
+        stub.search.assert_called_once_with(
+            query="CORS 403", max_results=3, min_quality=0.0, max_tokens=None, context=None)
+
+    def test_search_dict_input_ignores_extra_keys(self, stub):
+        from prior_tools.tools import PriorSearchTool
+
+        PriorSearchTool(client=stub).run({
+            "query": "q", "max_results": 5, "context": {"runtime": "node"}, "callbacks": None,
+        })
+        stub.search.assert_called_once_with(
+            query="q", max_results=5, min_quality=0.0, max_tokens=None, context={"runtime": "node"})
+
+    def test_contribute_dict_input_maps_fields(self, stub):
+        from prior_tools.tools import PriorContributeTool
+
+        PriorContributeTool(client=stub).run({
+            "title": "T", "content": "C", "tags": ["a"], "model": "m",
+            "errorMessages": ["e"], "failedApproaches": ["f"], "environment": {"os": "linux"},
+            "callbacks": None,
+        })
+        kw = stub.contribute.call_args[1]
+        assert (kw["title"], kw["tags"], kw["model"], kw["ttl"]) == ("T", ["a"], "m", "90d")
+        assert kw["error_messages"] == ["e"]
+        assert kw["failed_approaches"] == ["f"]
+        assert kw["environment"] == {"os": "linux"}
+
+    def test_contribute_rejects_string(self, stub):
+        from prior_tools.tools import PriorContributeTool
+
+        assert "error" in PriorContributeTool(client=stub).run("T")
+        stub.contribute.assert_not_called()
+
+    def test_feedback_dict_input_maps_fields(self, stub):
+        from prior_tools.tools import PriorFeedbackTool
+
+        PriorFeedbackTool(client=stub).run({
+            "id": "k_1", "outcome": "not_useful", "reason": "old", "correction": "x" * 100,
+            "callbacks": None,
+        })
+        stub.feedback.assert_called_once_with(
+            entry_id="k_1", outcome="not_useful", notes=None, reason="old",
+            correction={"content": "x" * 100}, correction_id=None)
+
+    def test_feedback_rejects_string(self, stub):
+        from prior_tools.tools import PriorFeedbackTool
+
+        assert "error" in PriorFeedbackTool(client=stub).run("k_1")
+        stub.feedback.assert_not_called()
+
+    @pytest.mark.parametrize("tool_input", ["k_1", {"id": "k_1", "callbacks": None}])
+    def test_get_string_or_dict_input(self, stub, tool_input):
+        from prior_tools.tools import PriorGetTool
+
+        assert PriorGetTool(client=stub).run(tool_input) is stub.get_entry.return_value
+        stub.get_entry.assert_called_once_with(entry_id="k_1")
+
+    def test_get_rejects_other_input(self, stub):
+        from prior_tools.tools import PriorGetTool
+
+        assert "error" in PriorGetTool(client=stub).run(42)
+        stub.get_entry.assert_not_called()
 
-        with patch("requests.request", return_value=mock_resp) as mock_req:
-            client.feedback("k_1", "useful", notes="worked great")
-            body = mock_req.call_args[1]["json"]
-            assert body["outcome"] == "useful"
+
+class TestRetract:
+    def test_retract_ignores_body(self, client, http):
+        resp = MagicMock(status_code=200)
+        type(resp).content = property(lambda self: pytest.fail("body was read"))
+
+        http.return_value = resp
+        assert client.retract("k_1") is None
+        assert http.call_args[0][0] == "DELETE"
+        resp.raise_for_status.assert_called_once()
 
 
 class TestNoApiKey:
     def test_raises_when_no_key(self):
         config = {"base_url": "https://test.example.com", "api_key": None, "agent_id": None}
-        with patch("prior_tools.client.load_config", return_value=config):
+        with patch("prior_tools.config.load_config", return_value=config):
             with pytest.raises(RuntimeError, match="No auth configured"):
                 PriorClient()
 
 
+class TestAuthRetry:
+    def test_refreshes_and_retries_once_on_401(self, mock_config, http):
+        config = dict(mock_config, tokens={
+            "access_token": "tok_old", "refresh_token": "ref_1", "expires_at": 9e15,
+        })
+        with patch("prior_tools.config.load_config", return_value=config):
+            c = PriorClient()
+
+        rejected = mock_response({})
+        rejected.status_code = 401
+        refreshed = mock_response({"access_token": "tok_new", "expires_in": 3600})
+        ok = mock_response({"ok": True})
+        ok.status_code = 200
+
+        http.side_effect = [rejected, refreshed, ok]
+        with patch("prior_tools.config.load_config", return_value={}), \
+                patch("prior_tools.config.save_config"):
+            assert c.me() == {"ok": True}
+        assert http.call_count == 3
+        assert c._session.headers["Authorization"] == "Bearer tok_new"
+
+        import requests
+
+        method, url = http.call_args_list[1][0]
+        refresh = c._session.prepare_request(
+            requests.Request(method, url, headers=http.call_args_list[1][1]["headers"]))
+        assert url.endswith("/token")
+        assert "Authorization" not in refresh.headers
+
+    def test_httpx_refresh_sends_no_bearer_token(self, mock_config):
+        fake_httpx = MagicMock()
+        config = dict(mock_config, tokens={"access_token": "tok_old", "refresh_token": "ref_1"})
+        with patch.dict(sys.modules, {"httpx": fake_httpx}):
+            with patch("prior_tools.config.load_config", return_value=config):
+                c = PriorClient(http2=True)
+        request = fake_httpx.Client.return_value.build_request.return_value
+        request.headers = {"Authorization": "Bearer tok_old"}
+
+        c._refresh()
+        assert request.headers == {}
+        c._session.send.assert_called_once_with(request)
+
+    def test_api_key_401_is_not_retried(self, client, http):
+        rejected = mock_response({})
+        rejected.status_code = 401
+        rejected.raise_for_status.side_effect = RuntimeError("401")
+
+        http.return_value = rejected
+        with pytest.raises(RuntimeError, match="401"):
+            client.me()
+        assert http.call_count == 1
+
+
 class TestStatus:
-    def test_me(self, client):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"agentId": "ag_test", "credits": 100}
-        mock_resp.content = b'{}'
-
-        with patch("requests.request", return_value=mock_resp):
-            result = client.me()
-            assert result["agentId"] == "ag_test"
+    def test_me(self, client, http):
+        mock_resp = mock_response({"agentId": "ag_test", "credits": 100})
+
+        http.return_value = mock_resp
+        result = client.me()
+        assert result["agentId"] == "ag_test"
+
+
+class TestEtagCache:
+    def test_revalidates_get_with_etag(self, fresh_client, http):
+        first = mock_response({"id": "k_1", "title": "Cached"})
+        first.headers = {"ETag": '"v1"'}
+        not_modified = mock_response({})
+        not_modified.status_code = 304
+        not_modified.content = b""
+
+        http.side_effect = [first, not_modified]
+        assert fresh_client.get_entry("k_1")["title"] == "Cached"
+        again = fresh_client.get_entry("k_1")
+        assert again["title"] == "Cached"
+        assert http.call_args[1]["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_conditional_header_merges_with_caller_headers(self, fresh_client, http):
+        url = fresh_client._url_me
+        fresh_client._sync_auth()
+        fresh_client._etag_store(url, '"v1"', b'{"cached": true}')
+        not_modified = mock_response({})
+        not_modified.status_code = 304
+
+        http.return_value = not_modified
+        assert fresh_client._request("GET", url, headers={"X-Trace": "t1"}) == {"cached": True}
+        assert http.call_args[1]["headers"] == {"X-Trace": "t1", "If-None-Match": '"v1"'}
+
+    def test_token_change_drops_cached_entries(self, fresh_client, http):
+        first = mock_response({"id": "k_1", "owner": "a"})
+        first.headers = {"ETag": '"v1"'}
+        other = mock_response({"id": "k_1", "owner": "b"})
+
+        http.side_effect = [first, other]
+        fresh_client.get_entry("k_1")
+        fresh_client.api_key = "ask_other_key"
+        assert fresh_client.get_entry("k_1")["owner"] == "b"
+        assert "headers" not in http.call_args[1]
+
+    def test_304_without_cached_body_returns_none(self, fresh_client, http):
+        not_modified = mock_response({})
+        not_modified.status_code = 304
+        not_modified.content = b""
+
+        http.return_value = not_modified
+        assert fresh_client._request("GET", fresh_client._url_me, headers={"If-None-Match": '"x"'}) is None
+        not_modified.raise_for_status.assert_not_called()
+
+    def test_post_is_not_cached(self, client, http):
+        resp = mock_response({"ok": True})
+        resp.headers = {"ETag": '"v1"'}
+
+        http.return_value = resp
+        client.search("q")
+        client.search("q")
+        assert "headers" not in http.call_args[1]
+
+
+class TestSession:
+    def test_calls_share_one_session(self, client, http):
+        mock_resp = mock_response({})
+
+        http.return_value = mock_resp
+        client.me()
+        client.credits()
+        assert http.call_count == 2
+        assert "headers" not in http.call_args[1]
+        assert client._session.headers["Authorization"] == "Bearer ask_test_key"
+
+    def test_auth_header_follows_token_changes(self, fresh_client):
+        fresh_client._sync_auth()
+        assert fresh_client._session.headers["Authorization"] == "Bearer ask_test_key"
+        fresh_client._tokens = {"access_token": "tok_new"}
+        fresh_client._sync_auth()
+        assert fresh_client._session.headers["Authorization"] == "Bearer tok_new"
+
+    def test_methods_can_be_patched_per_instance(self, fresh_client):
+        with patch.object(fresh_client, "search", return_value={"ok": True}) as mock_search:
+            assert fresh_client.search("q") == {"ok": True}
+        mock_search.assert_called_once_with("q")
+
+    @pytest.mark.parametrize("url", ["https://test.example.com", "http://localhost:8080"])
+    def test_adapter_retries_gateway_errors(self, client, url):
+        adapter = client._session.get_adapter(url)
+        assert adapter.max_retries.total == 2
+        assert 503 in adapter.max_retries.status_forcelist
+        assert adapter._pool_maxsize == 16
+
+    def test_timeout_applies_to_requests(self, mock_config, http):
+        with patch("prior_tools.config.load_config", return_value=mock_config):
+            c = PriorClient(timeout=5)
+        http.return_value = mock_response({})
+        c.me()
+        assert http.call_args[1]["timeout"] == 5
+
+    def test_context_manager_closes_session(self, fresh_client):
+        with patch("requests.Session.close") as mock_close:
+            with fresh_client as c:
+                assert c is fresh_client
+            mock_close.assert_called_once()
+
+
+class TestHttp2:
+    def test_uses_httpx_client_when_available(self, mock_config):
+        fake_httpx = MagicMock()
+        with patch.dict(sys.modules, {"httpx": fake_httpx}):
+            with patch("prior_tools.config.load_config", return_value=mock_config):
+                c = PriorClient(http2=True)
+        assert c._session is fake_httpx.Client.return_value
+        assert fake_httpx.Client.call_args[1]["http2"] is True
+
+    def test_enabled_from_config(self, mock_config):
+        fake_httpx = MagicMock()
+        with patch.dict(sys.modules, {"httpx": fake_httpx}):
+            with patch("prior_tools.config.load_config", return_value=dict(mock_config, http2=True)):
+                c = PriorClient()
+        assert c._session is fake_httpx.Client.return_value
+
+    def test_enabled_from_env_without_touching_config(self, mock_config, monkeypatch):
+        from prior_tools.config import load_config
+
+        monkeypatch.setenv("PRIOR_HTTP2", "1")
+        assert "http2" not in load_config()
+        fake_httpx = MagicMock()
+        with patch.dict(sys.modules, {"httpx": fake_httpx}):
+            with patch("prior_tools.config.load_config", return_value=mock_config):
+                c = PriorClient()
+        assert c._session is fake_httpx.Client.return_value
+
+    @pytest.mark.parametrize("value", ["false", "0", 0, None])
+    def test_disabled_config_values(self, mock_config, monkeypatch, value):
+        import requests
+
+        monkeypatch.delenv("PRIOR_HTTP2", raising=False)
+        with patch.dict(sys.modules, {"httpx": MagicMock()}):
+            with patch("prior_tools.config.load_config", return_value=dict(mock_config, http2=value)):
+                c = PriorClient()
+        assert isinstance(c._session, requests.Session)
+
+    def test_falls_back_to_requests_without_httpx(self, mock_config):
+        import requests
+
+        with patch.dict(sys.modules, {"httpx": None}):
+            with patch("prior_tools.config.load_config", return_value=mock_config):
+                c = PriorClient(http2=True)
+        assert isinstance(c._session, requests.Session)
+
+
+class TestAsyncClient:
+    def test_search_many_keeps_query_order(self, client, http):
+        def respond(method, url, **kwargs):
+            return mock_response({"query": json.loads(kwargs["data"])["query"]})
+
+        http.side_effect = respond
+        results = asyncio.run(AsyncPriorClient(client).search_many(["a", "b", "c"]))
+        assert [r["query"] for r in results] == ["a", "b", "c"]
+
+    def test_me_and_credits_concurrently(self, client, http):
+        async def status(ac):
+            return await asyncio.gather(ac.me(), ac.credits())
+
+        http.return_value = mock_response({"ok": True})
+        assert asyncio.run(status(AsyncPriorClient(client))) == [{"ok": True}, {"ok": True}]
+        assert http.call_count == 2
+
+    def test_close_leaves_passed_in_client_open(self, fresh_client):
+        async def use(ac):
+            async with ac:
+                pass
+
+        with patch("requests.Session.close") as mock_close:
+            asyncio.run(use(AsyncPriorClient(fresh_client)))
+        mock_close.assert_not_called()
+
+    def test_close_closes_client_it_built(self, mock_config):
+        with patch("prior_tools.config.load_config", return_value=mock_config):
+            ac = AsyncPriorClient(timeout=5)
+        with patch("requests.Session.close") as mock_close:
+            asyncio.run(ac.close())
+        mock_close.assert_called_once()
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Point prior_tools.config at an empty temp dir, with no env overrides."""
+    import prior_tools.config as config
+
+    for var in ("PRIOR_BASE_URL", "PRIOR_API_KEY", "PRIOR_AGENT_ID"):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_FILE", tmp_path / "config.json")
+    config.invalidate_config_cache()
+    yield tmp_path / "config.json"
+    config.invalidate_config_cache()
+
+
+class TestConfigCache:
+    CONFIG = {"api_key": "ask_1", "tokens": {"access_token": "tok_1", "refresh_token": "ref_1"}}
+
+    def test_unchanged_file_is_read_once(self, config_file):
+        from prior_tools.config import load_config
+
+        config_file.write_text(json.dumps(self.CONFIG))
+        with patch("prior_tools.config.open", create=True, side_effect=open) as mock_open:
+            assert load_config()["api_key"] == "ask_1"
+            assert load_config()["api_key"] == "ask_1"
+        assert mock_open.call_count == 1
+
+    def test_change_on_disk_is_picked_up(self, config_file):
+        import os
+
+        from prior_tools.config import load_config
+
+        config_file.write_text(json.dumps(self.CONFIG))
+        assert load_config()["api_key"] == "ask_1"
+        config_file.write_text(json.dumps(dict(self.CONFIG, api_key="ask_2")))  # Same size
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_config()["api_key"] == "ask_2"
+
+    def test_save_config_invalidates_cache(self, config_file):
+        import prior_tools.config as config
+
+        config_file.write_text(json.dumps(self.CONFIG))
+        config.load_config()
+        config.save_config(dict(self.CONFIG, api_key="ask_2"))
+        assert config._CACHE is None
+        assert config.load_config()["api_key"] == "ask_2"
+
+    def test_mutating_result_does_not_leak(self, config_file):
+        from prior_tools.config import load_config
+
+        config_file.write_text(json.dumps(self.CONFIG))
+        first = load_config()
+        first["api_key"] = "changed"
+        first["tokens"]["access_token"] = "changed"
+        first["http2"] = True
+        again = load_config()
+        assert again["api_key"] == "ask_1"
+        assert again["tokens"] == self.CONFIG["tokens"]
+        assert "http2" not in again
+
+
+class TestSaveConfig:
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_keeps_existing_file_mode(self, config_file):
+        from prior_tools.config import load_config, save_config
+
+        config_file.write_text("{}")
+        config_file.chmod(0o600)
+        save_config({"api_key": "ask_new"})
+        assert config_file.stat().st_mode & 0o777 == 0o600
+        assert load_config()["api_key"] == "ask_new"
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+    def test_new_file_is_owner_only(self, config_file):
+        from prior_tools.config import save_config
+
+        save_config({"api_key": "ask_new"})
+        assert config_file.stat().st_mode & 0o777 == 0o600
+        assert [p.name for p in config_file.parent.iterdir()] == ["config.json"]
+
+
+class TestPackage:
+    @pytest.mark.parametrize("module", ["async_client", "cli", "client", "config", "tools"])
+    def test_submodule_attribute_without_import(self, module):
+        # A fresh interpreter: in this one the submodules are already imported
+        code = f"import prior_tools; print(prior_tools.{module}.__name__)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        assert out.strip() == f"prior_tools.{module}"